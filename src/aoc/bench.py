@@ -0,0 +1,191 @@
+"""Benchmarks every solver variant of every day and records the results as JSON.
+
+A solution module lists its variants in BENCHMARKS, a dict of name to a callable taking the
+output of the module's parse, or to a (parse, solve) pair for variants that need a different
+representation of the input. Parsing is never timed. Variants that take too long to run by
+default are listed in SLOW_BENCHMARKS. Modules without BENCHMARKS are benchmarked on part1 and part2.
+A module can also report throughput by defining BENCHMARK_SIZE, a pair of the unit of work
+(e.g. 'cells') and a callable measuring the raw input in that unit.
+
+Usage: python src/aoc/bench.py [--day 9] [--variant 'compact.*'] [--repeat 5] [--json out.json]
+"""
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from dataclasses import asdict, dataclass
+from input import read_input
+from typing import Any
+import argparse
+import datetime
+import json
+import math
+import platform
+import re
+import statistics
+import subprocess
+import time
+import tracemalloc
+
+import runner
+
+
+@dataclass
+class Stats():
+    year: int
+    day: int
+    variant: str
+    warmup: int
+    repeat: int
+    # wall times in seconds
+    min: float
+    median: float
+    p95: float
+    # peak bytes allocated by a single call, as traced by tracemalloc
+    peak_memory: int
+    # units of work per second at the median time, for modules with BENCHMARK_SIZE
+    throughput: float | None = None
+    unit: str | None = None
+
+
+type Variant = tuple[Callable[[str], Any], Callable[[Any], Any]]
+
+
+def variants(solution: runner.Solution, include_slow = False) -> dict[str, Variant]:
+    """Returns the benchmarked variants of a solution by name, as (parse, solve) pairs."""
+    module = solution.module
+    benchmarks = getattr(module, 'BENCHMARKS', None)
+    if benchmarks is None:
+        return {'part1': (solution.parse, solution.part1), 'part2': (solution.parse, solution.part2)}
+
+    slow = getattr(module, 'SLOW_BENCHMARKS', set())
+    return {name: variant if isinstance(variant, tuple) else (solution.parse, variant)
+            for name, variant in benchmarks.items()
+            if include_slow or name not in slow}
+
+
+def percentile(samples: list[float], q: float) -> float:
+    """Nearest-rank percentile of samples, for q in [0, 100]."""
+    ordered = sorted(samples)
+    rank = max(math.ceil(q / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def measure(fn: Callable[[Any], Any], arg: Any, warmup = 1, repeat = 5) -> tuple[list[float], int]:
+    """Calls fn(arg) warmup times untimed, then repeat times timed.
+    Peak memory is measured on one extra call, since tracing allocations slows the call down.
+    Returns: (wall times in seconds, peak bytes allocated)
+    """
+    for _ in range(warmup):
+        fn(arg)
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(arg)
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        fn(arg)
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return times, peak
+
+
+def run(solutions: Iterable[runner.Solution],
+        filename = 'input.txt',
+        variant_pattern: str | None = None,
+        include_slow = False,
+        warmup = 1,
+        repeat = 5) -> Iterable[Stats]:
+    """Benchmarks the variants of each solution whose name matches variant_pattern."""
+    pattern = re.compile(variant_pattern) if variant_pattern else None
+    for solution in solutions:
+        selected = {name: fn for name, fn in variants(solution, include_slow).items()
+                    if pattern is None or pattern.search(name)}
+        if not selected:
+            continue
+
+        input = read_input(solution.year, solution.day, filename)
+        unit, size = None, None
+        if (benchmark_size := getattr(solution.module, 'BENCHMARK_SIZE', None)) is not None:
+            unit, size_of = benchmark_size
+            size = size_of(input)
+        # each representation of the input is only built once
+        parsed_by = {}
+        for name, (parse, fn) in selected.items():
+            if parse not in parsed_by:
+                parsed_by[parse] = parse(input)
+            times, peak = measure(fn, parsed_by[parse], warmup, repeat)
+            median = statistics.median(times)
+            yield Stats(solution.year, solution.day, name, warmup, repeat,
+                        min(times), median, percentile(times, 95), peak,
+                        size / median if size is not None else None, unit)
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def format_throughput(stats: Stats) -> str:
+    if stats.throughput is None:
+        return ''
+    return f"\t{stats.throughput:>10.3g} {stats.unit}/s"
+
+
+def compare(stats: Stats, baseline: dict[tuple[int, int, str], dict]) -> str:
+    """Describes the change in median time against a previous run, if it had this variant."""
+    previous = baseline.get((stats.year, stats.day, stats.variant))
+    if previous is None:
+        return ''
+    return f"\t({stats.median / previous['median']:.2f}x baseline)"
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Benchmark AoC solver variants")
+    parser.add_argument('--year', type=int, default=None, help="only benchmark solutions for this year")
+    parser.add_argument('--day', type=int, action='append', help="only benchmark this day (repeatable)")
+    parser.add_argument('--variant', default=None, help="only benchmark variants matching this regex")
+    parser.add_argument('--input', default='input.txt', help="input filename in each day's resources directory")
+    parser.add_argument('--warmup', type=int, default=1, help="untimed calls before timing")
+    parser.add_argument('--repeat', type=int, default=5, help="timed calls per variant")
+    parser.add_argument('--include-slow', action='store_true', help="also run variants in SLOW_BENCHMARKS")
+    parser.add_argument('--json', default=None, help="write results to this file")
+    parser.add_argument('--baseline', default=None, help="compare against results previously written with --json")
+    args = parser.parse_args(argv)
+
+    solutions = [s for (_year, day), s in runner.discover(args.year).items() if not args.day or day in args.day]
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = {(r['year'], r['day'], r['variant']): r for r in json.load(f)['results']}
+
+    results = []
+    for stats in run(solutions, args.input, args.variant, args.include_slow, args.warmup, args.repeat):
+        results.append(stats)
+        print(f"{stats.year} day {stats.day:>2} {stats.variant:<32}"
+              f"min {stats.min * 1000:>10.2f} ms\t"
+              f"median {stats.median * 1000:>10.2f} ms\t"
+              f"p95 {stats.p95 * 1000:>10.2f} ms\t"
+              f"peak {stats.peak_memory / 1024:>10.1f} KiB"
+              f"{format_throughput(stats)}"
+              f"{compare(stats, baseline)}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({
+                'commit': git_commit(),
+                'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                'python': platform.python_version(),
+                'input': args.input,
+                'results': [asdict(r) for r in results],
+            }, f, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,215 @@
+"""Seeded generators of synthetic puzzle inputs, for measuring how the solvers scale.
+
+Each generator takes a random number generator and a size, and returns the input as a string.
+What size means depends on the day, e.g. the number of lines or the side of a square grid.
+The generated inputs keep the invariants the solvers rely on, so they can be solved like
+the real input.
+
+Usage: python src/aoc/generate.py --day 9 --size 1000000 [--seed 0]
+Writes resources/2024/9/synthetic_1000000.txt, which can be benchmarked with
+python src/aoc/bench.py --day 9 --input synthetic_1000000.txt
+"""
+from collections.abc import Callable
+from input import input_path
+import argparse
+import random
+
+YEAR = 2024
+
+type Generator = Callable[[random.Random, int], str]
+
+
+def gen_day1(rng: random.Random, size: int) -> str:
+    """size is the number of lines. Right values repeat so the similarity score is non-trivial."""
+    right_pool = [rng.randint(10000, 99999) for _ in range(max(size // 4, 1))]
+    return '\n'.join(f"{rng.randint(10000, 99999)}   {rng.choice(right_pool)}" for _ in range(size))
+
+
+def gen_day2(rng: random.Random, size: int) -> str:
+    """size is the number of reports. Roughly half start out safe, then some get one bad level.
+    Levels are clamped to 1-99, like the real input."""
+    reports = []
+    for _ in range(size):
+        direction = rng.choice((-1, 1))
+        level = rng.randint(10, 90)
+        report = [level]
+        for _ in range(rng.randint(4, 7)):
+            level += direction * rng.randint(1, 3)
+            report.append(level)
+        if rng.random() < 0.5:
+            report[rng.randrange(len(report))] += rng.choice((-5, -1, 1, 5))
+        reports.append(' '.join(str(min(max(l, 1), 99)) for l in report))
+    return '\n'.join(reports)
+
+
+def gen_day3(rng: random.Random, size: int) -> str:
+    """size is the number of instructions and junk fragments in the corrupted memory."""
+    junk = "!@#$%^&*()[]{}<>?/\\'+-_=:; ,"
+    def fragment() -> str:
+        match rng.randrange(8):
+            case 0 | 1 | 2:
+                return f"mul({rng.randint(1, 999)},{rng.randint(1, 999)})"
+            case 3:
+                # almost valid instructions which must not be matched
+                return rng.choice([f"mul({rng.randint(1, 999)}, {rng.randint(1, 999)})",
+                                   f"mul[{rng.randint(1, 999)},{rng.randint(1, 999)}]",
+                                   f"mul({rng.randint(1000, 9999)},{rng.randint(1, 9)})",
+                                   "mul(4*", "don't", "do("])
+            case 4:
+                return "do()"
+            case 5:
+                return "don't()"
+            case _:
+                return ''.join(rng.choices(junk + "mulwhyfromselect", k=rng.randint(1, 8)))
+    return ''.join(fragment() for _ in range(size))
+
+
+def gen_day4(rng: random.Random, size: int) -> str:
+    """size is the side of the square word search."""
+    return '\n'.join(''.join(rng.choices('XMAS', k=size)) for _ in range(size))
+
+
+def gen_day5(rng: random.Random, size: int) -> str:
+    """size is the number of updates.
+    The rules are every ordered pair of a hidden total order of the pages, so they're acyclic
+    and every update has exactly one correct order."""
+    pages = rng.sample(range(10, 100), 49)
+    rules = [f"{before}|{after}" for i, before in enumerate(pages) for after in pages[i + 1:]]
+    rng.shuffle(rules)
+
+    updates = []
+    for _ in range(size):
+        update = rng.sample(pages, rng.randrange(5, 24, 2))
+        if rng.random() < 0.5:
+            # already in the correct order
+            update.sort(key=pages.index)
+        updates.append(','.join(str(p) for p in update))
+
+    return '\n'.join(rules) + '\n\n' + '\n'.join(updates)
+
+
+def guard_leaves(rows: list[list[str]], guard_row: int, guard_col: int) -> bool:
+    """Walks a guard facing up through a lab, turning right at obstacles.
+    Returns whether it leaves the lab rather than walking in a loop."""
+    size = len(rows)
+    d_row, d_col = -1, 0
+    seen: set[tuple[int, int, int, int]] = set()
+    row, col = guard_row, guard_col
+    while (row, col, d_row, d_col) not in seen:
+        seen.add((row, col, d_row, d_col))
+        next_row, next_col = row + d_row, col + d_col
+        if not (0 <= next_row < size and 0 <= next_col < size):
+            return True
+        if rows[next_row][next_col] == '#':
+            d_row, d_col = d_col, -d_row
+        else:
+            row, col = next_row, next_col
+    return False
+
+
+def gen_day6(rng: random.Random, size: int) -> str:
+    """size is the side of the square lab. There is exactly one guard, facing up, and it
+    leaves the lab: labs where it would walk in a loop are thrown away and regenerated."""
+    while True:
+        rows = [['#' if rng.random() < 0.05 else '.' for _ in range(size)] for _ in range(size)]
+        guard_row, guard_col = rng.randrange(size), rng.randrange(size)
+        rows[guard_row][guard_col] = '^'
+        if guard_leaves(rows, guard_row, guard_col):
+            return '\n'.join(''.join(row) for row in rows)
+
+
+def gen_day7(rng: random.Random, size: int) -> str:
+    """size is the number of equations.
+    Most test values are produced by some sequence of +, * and ||, the rest are off by one."""
+    lines = []
+    for _ in range(size):
+        operands = [rng.randint(1, 999) for _ in range(rng.randint(2, 12))]
+        value = operands[0]
+        for operand in operands[1:]:
+            match rng.randrange(3):
+                case 0:
+                    value += operand
+                case 1:
+                    value *= operand
+                case 2:
+                    value = value * 10 ** len(str(operand)) + operand
+        if rng.random() < 0.3:
+            value += 1
+        lines.append(f"{value}: {' '.join(str(o) for o in operands)}")
+    return '\n'.join(lines)
+
+
+FREQUENCIES = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz'
+
+def gen_day8(rng: random.Random, size: int) -> str:
+    """size is the side of the square map. Antennae cover about 7.5% of it, like the real input."""
+    rows = [['.'] * size for _ in range(size)]
+    per_freq = max(int(size * size * 0.075 / len(FREQUENCIES)), 4)
+    cells = rng.sample(range(size * size), min(per_freq * len(FREQUENCIES), size * size))
+    for i, cell in enumerate(cells):
+        rows[cell // size][cell % size] = FREQUENCIES[i % len(FREQUENCIES)]
+    return '\n'.join(''.join(row) for row in rows)
+
+
+def gen_day9(rng: random.Random, size: int) -> str:
+    """size is the number of files. Files have 1-9 blocks and the last file has no free space after it."""
+    digits = []
+    for _ in range(size):
+        digits.append(str(rng.randint(1, 9)))
+        digits.append(str(rng.randint(0, 9)))
+    # the disk map alternates file, free, so it ends on a file
+    return ''.join(digits[:-1])
+
+
+def gen_day10(rng: random.Random, size: int) -> str:
+    """size is the side of the square map.
+    Heights climb diagonally, with a fraction replaced by noise so trails branch and dead-end."""
+    rows = []
+    for row in range(size):
+        rows.append(''.join(str(rng.randrange(10)) if rng.random() < 0.3 else str((row + col) % 10)
+                            for col in range(size)))
+    return '\n'.join(rows)
+
+
+GENERATORS: dict[int, Generator] = {
+    1: gen_day1,
+    2: gen_day2,
+    3: gen_day3,
+    4: gen_day4,
+    5: gen_day5,
+    6: gen_day6,
+    7: gen_day7,
+    8: gen_day8,
+    9: gen_day9,
+    10: gen_day10,
+}
+
+
+def generate(day: int, size: int, seed: int = 0) -> str:
+    """Generates a synthetic input for the day. The same seed always produces the same input."""
+    if day not in GENERATORS:
+        raise ValueError(f"No generator for {YEAR} day {day}")
+    if size < 1:
+        raise ValueError(f"Size must be positive, was {size}")
+    return GENERATORS[day](random.Random(seed), size)
+
+
+def synthetic_filename(size: int, seed: int = 0) -> str:
+    return f"synthetic_{size}.txt" if seed == 0 else f"synthetic_{size}_{seed}.txt"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic AoC inputs")
+    parser.add_argument('--day', type=int, action='append', required=True, help="day to generate (repeatable)")
+    parser.add_argument('--size', type=int, required=True, help="size of the input, see each generator")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    for day in args.day:
+        path = input_path(filename=synthetic_filename(args.size, args.seed), year=YEAR, day=day)
+        with open(path, 'w') as f:
+            f.write(generate(day, args.size, args.seed))
+        print(f"Wrote {path}")
+
+if __name__ == '__main__':
+    main()
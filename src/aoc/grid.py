@@ -0,0 +1,119 @@
+"""Flat grids with padded borders, shared by the grid puzzles.
+
+Cells are bytes stored row-major in one bytearray, with a border of padding cells around
+the grid. Walking off an edge lands on padding rather than outside the buffer, so looking
+up a neighbor is adding a precomputed offset to a flat index, with no bounds checks, as
+long as the lookup doesn't reach further than the padding is wide.
+"""
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from input import iter_lines, strip
+
+# (row, col) deltas. Both are clockwise from up.
+ORTHOGONAL = ((-1, 0), (0, 1), (1, 0), (0, -1))
+ALL_DIRECTIONS = ((-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1))
+
+# value of padding cells unless a grid says otherwise. Puzzle inputs are printable ASCII.
+PADDING = 0
+
+
+@dataclass
+class PaddedGrid():
+    # dimensions without the padding
+    row_count: int
+    col_count: int
+    # width of the border of padding cells on every side
+    pad: int
+    # value of the padding cells
+    fill: int
+    cells: bytearray
+
+
+    def from_bytes(buf, pad: int = 1, fill: int = PADDING) -> PaddedGrid:
+        """Parses a rectangular grid of one byte per cell from a buffer of lines,
+        e.g. bytes or an mmap from input.open_input_mmap. Each row is copied in one slice.
+        Whitespace around the grid is ignored, like read_input strips it."""
+        with strip(buf) as view:
+            lines = list(iter_lines(view))
+            if len(lines) == 0 or len(lines[0]) == 0:
+                raise ValueError("Expected the grid to have at least one row and column")
+
+            row_count, col_count = len(lines), len(lines[0])
+            stride = col_count + 2 * pad
+            cells = bytearray([fill]) * ((row_count + 2 * pad) * stride)
+            for row, line in enumerate(lines):
+                if len(line) != col_count:
+                    raise ValueError(f"Expected all rows to have length {col_count}, but row {row} had length {len(line)}")
+                start = (row + pad) * stride + pad
+                cells[start:start + col_count] = line
+                line.release()
+
+        return PaddedGrid(row_count, col_count, pad, fill, cells)
+
+
+    def from_str(input: str, pad: int = 1, fill: int = PADDING) -> PaddedGrid:
+        return PaddedGrid.from_bytes(input.encode('ascii'), pad, fill)
+
+
+    @property
+    def stride(self) -> int:
+        """Distance between vertically adjacent cells"""
+        return self.col_count + 2 * self.pad
+
+
+    def index(self, row: int, col: int) -> int:
+        """Flat index of the cell at (row, col), which may be in the padding"""
+        return (row + self.pad) * self.stride + col + self.pad
+
+
+    def position(self, i: int) -> tuple[int, int]:
+        """(row, col) of the cell at flat index i"""
+        row, col = divmod(i, self.stride)
+        return row - self.pad, col - self.pad
+
+
+    def offsets(self, directions: Iterable[tuple[int, int]] = ORTHOGONAL) -> tuple[int, ...]:
+        """Flat index offsets of one step in each direction"""
+        return tuple(d_row * self.stride + d_col for d_row, d_col in directions)
+
+
+    def in_bounds(self, row: int, col: int) -> bool:
+        return 0 <= row < self.row_count and 0 <= col < self.col_count
+
+
+    def indices(self) -> Iterator[int]:
+        """Flat indices of all cells outside the padding, row by row"""
+        for row in range(self.row_count):
+            start = self.index(row, 0)
+            yield from range(start, start + self.col_count)
+
+
+    def find_all(self, value: int) -> list[int]:
+        """Flat indices of all cells with the value, in row-major order.
+        value must differ from fill."""
+        return list(self.iter_find(value))
+
+
+    def iter_find(self, value: int) -> Iterator[int]:
+        """Like find_all, without holding all the indices at once"""
+        needle = bytes([value])
+        i = self.cells.find(needle)
+        while i != -1:
+            yield i
+            i = self.cells.find(needle, i + 1)
+
+
+    def row(self, row: int) -> bytearray:
+        """Copy of a row's cells, without the padding"""
+        start = self.index(row, 0)
+        return self.cells[start:start + self.col_count]
+
+
+    def copy(self) -> PaddedGrid:
+        return PaddedGrid(self.row_count, self.col_count, self.pad, self.fill, self.cells[:])
+
+
+    def __str__(self) -> str:
+        return '\n'.join(self.row(row).decode('ascii') for row in range(self.row_count))
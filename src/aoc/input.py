@@ -1,8 +1,13 @@
+from collections.abc import Iterator
 from pathlib import Path
+import mmap
 import os
 import re
 import sys
 
+# src/aoc/input.py -> project root
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
 def _get_solution_year_and_number(f):
     """Extract year and problem numbers from an AoC solution filename.
     Expected format: solution2024_1.py or similar
@@ -24,21 +29,100 @@ def _get_solution_year_and_number(f):
     
     return year, problem
 
-def open_input(f=sys.argv[0], filename='input.txt'):
-    """Extract year and day numbers from an AoC solution filename and opens the file.
-    Filename is the name of the input file in the resources directory structure to open.
+def input_path(f=sys.argv[0], filename='input.txt', year: int | None = None, day: int | None = None) -> str:
+    """Builds the path of the input file in the resources directory structure.
+    If year and day are given they are used directly, relative to the project root.
+    Otherwise they are extracted from an AoC solution filename.
     Expected format: solution2024_1.py or similar
-    Returns: open input file
+    Returns: path to the input file
     """
-    year, problem = _get_solution_year_and_number(f)
-    
-    # Find project root (parent of src directory)
-    project_root = os.path.dirname(os.path.dirname(os.path.dirname(f)))
+    if year is not None and day is not None:
+        problem = day
+        project_root = PROJECT_ROOT
+    else:
+        year, problem = _get_solution_year_and_number(f)
+        # Find project root (parent of src directory)
+        project_root = os.path.dirname(os.path.dirname(os.path.dirname(f)))
     
     # Construct input file path
     input_path = os.path.join(project_root, 'resources', str(year), str(problem), filename)
     
     # Ensure directory exists
     os.makedirs(os.path.dirname(input_path), exist_ok=True)
-    return open(input_path, 'r')
+    return input_path
+
+
+def open_input(f=sys.argv[0], filename='input.txt', year: int | None = None, day: int | None = None):
+    """Opens the input file for a solution, identified by year and day or else by an AoC
+    solution filename (see input_path).
+    Filename is the name of the input file in the resources directory structure to open.
+    Expected format: solution2024_1.py or similar
+    Returns: open input file
+    """
+    return open(input_path(f, filename, year, day), 'r')
+
+
+def read_input(year: int, day: int, filename='input.txt') -> str:
+    """Reads the whole input file for the given day, stripped of surrounding whitespace."""
+    with open_input(filename=filename, year=year, day=day) as f:
+        return f.read().strip()
+
 
+def open_input_mmap(f=sys.argv[0], filename='input.txt', year: int | None = None, day: int | None = None) -> mmap.mmap:
+    """Like open_input, but maps the input file read-only into memory instead of reading it.
+    The result supports the buffer protocol, so it can be sliced with memoryview, searched
+    with bytes regexes, or passed to iter_lines/iter_tokens without copying the input.
+
+    Use it as a context manager. All memoryviews over the map must be released before it
+    is closed, otherwise close raises a BufferError.
+    Empty files can't be mapped, so they raise a ValueError.
+    Returns: read-only mmap of the input file
+    """
+    path = input_path(f, filename, year, day)
+    with open(path, 'rb') as in_file:
+        if os.fstat(in_file.fileno()).st_size == 0:
+            raise ValueError(f"Input file {path} is empty")
+        # the map keeps its own handle on the file, so the file object can be closed
+        return mmap.mmap(in_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def strip(buf) -> memoryview:
+    """Returns a view of buf without leading and trailing ASCII whitespace, like str.strip."""
+    view = memoryview(buf)
+    start, end = 0, len(view)
+    while start < end and view[start] in b' \t\r\n':
+        start += 1
+    while end > start and view[end - 1] in b' \t\r\n':
+        end -= 1
+    return view[start:end]
+
+
+NEWLINE_PATTERN = re.compile(b'\n')
+
+
+def iter_lines(buf) -> Iterator[memoryview]:
+    """Yields a view of each line in buf, without the line terminator.
+    buf is anything that supports the buffer protocol, e.g. bytes, an mmap or a memoryview from strip.
+    Like str.splitlines, a trailing newline doesn't produce an empty last line.
+    """
+    with memoryview(buf) as view:
+        start = 0
+        end = len(view)
+        while start < end:
+            newline = NEWLINE_PATTERN.search(view, start)
+            newline_i = newline.start() if newline is not None else end
+            line_end = newline_i
+            if line_end > start and view[line_end - 1] == ord('\r'):
+                line_end -= 1
+            yield view[start:line_end]
+            start = newline_i + 1
+
+
+def iter_tokens(buf, delimiters: bytes = b' \t\r\n') -> Iterator[memoryview]:
+    """Yields a view of each run of bytes in buf that doesn't contain one of the delimiters.
+    Empty tokens are skipped, so repeated delimiters act as one like str.split().
+    """
+    token_pattern = re.compile(b'[^' + re.escape(delimiters) + b']+')
+    with memoryview(buf) as view:
+        for m in token_pattern.finditer(view):
+            yield view[m.start():m.end()]
@@ -0,0 +1,106 @@
+"""Runs solutions in a single interpreter instead of one process per day.
+
+Each solutionYYYY_D.py module exposes its YEAR and DAY, and three callables:
+- parse(input: str), which converts the raw input into the day's representation
+- part1(parsed) and part2(parsed), which return the answer for each part
+
+Usage: python src/aoc/runner.py [--year 2024] [--day 9 --day 10] [--input example.txt]
+"""
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from input import read_input
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+import argparse
+import importlib
+import re
+import time
+
+SOLUTION_PATTERN = re.compile(r'solution(\d{4})_(\d+)\.py')
+
+
+@dataclass
+class Solution():
+    year: int
+    day: int
+    module: ModuleType
+    parse: Callable[[str], Any]
+    part1: Callable[[Any], Any]
+    part2: Callable[[Any], Any]
+
+
+@dataclass
+class Result():
+    solution: Solution
+    part1: Any
+    part2: Any
+    # wall time in seconds of each phase
+    parse_time: float
+    part1_time: float
+    part2_time: float
+
+
+def load(year: int, day: int) -> Solution:
+    """Imports the solution module for a day without running it."""
+    module = importlib.import_module(f"solution{year}_{day}")
+    for attr in ['YEAR', 'DAY', 'parse', 'part1', 'part2']:
+        if not hasattr(module, attr):
+            raise ValueError(f"Solution module {module.__name__} doesn't define {attr}")
+    if (module.YEAR, module.DAY) != (year, day):
+        raise ValueError(f"Solution module {module.__name__} is for year {module.YEAR}, day {module.DAY}")
+
+    return Solution(year, day, module, module.parse, module.part1, module.part2)
+
+
+def discover(year: int | None = None) -> dict[tuple[int, int], Solution]:
+    """Finds all python solutions next to this module, optionally only for one year.
+    Returns: registry of (year, day) to solution, in chronological order
+    """
+    found = []
+    for path in Path(__file__).parent.glob('solution*.py'):
+        match = SOLUTION_PATTERN.fullmatch(path.name)
+        if match is None:
+            continue
+        solution_year, day = int(match.group(1)), int(match.group(2))
+        if year is None or solution_year == year:
+            found.append((solution_year, day))
+
+    return {(y, d): load(y, d) for y, d in sorted(found)}
+
+
+def run(solution: Solution, filename: str = 'input.txt') -> Result:
+    """Parses the day's input and solves both parts, timing each phase."""
+    input = read_input(solution.year, solution.day, filename)
+
+    start = time.perf_counter()
+    parsed = solution.parse(input)
+    parsed_at = time.perf_counter()
+    pt1 = solution.part1(parsed)
+    pt1_at = time.perf_counter()
+    pt2 = solution.part2(parsed)
+    pt2_at = time.perf_counter()
+
+    return Result(solution, pt1, pt2, parsed_at - start, pt1_at - parsed_at, pt2_at - pt1_at)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run AoC solutions in one process")
+    parser.add_argument('--year', type=int, default=None, help="only run solutions for this year")
+    parser.add_argument('--day', type=int, action='append', help="only run this day (repeatable)")
+    parser.add_argument('--input', default='input.txt', help="input filename in each day's resources directory")
+    args = parser.parse_args()
+
+    for (year, day), solution in discover(args.year).items():
+        if args.day and day not in args.day:
+            continue
+        result = run(solution, args.input)
+        print(f"{year} day {day:>2}:\tpt 1 = {result.part1}\tpt 2 = {result.part2}\t"
+              f"(parse {result.parse_time * 1000:.2f} ms, "
+              f"pt 1 {result.part1_time * 1000:.2f} ms, "
+              f"pt 2 {result.part2_time * 1000:.2f} ms)")
+
+if __name__ == '__main__':
+    main()
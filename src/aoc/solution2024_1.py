@@ -1,46 +1,45 @@
-from input import open_input
+from input import read_input
 from collections import defaultdict
 import bisect
 import re
 
-def get_sorted_lists():
-    """Opens the input for this problem and reads the lists into
+YEAR = 2024
+DAY = 1
+
+def get_sorted_lists(input: str) -> tuple[list[int], list[int]]:
+    """Reads the lists in the input for this problem into
     a sorted left and right lists, which are returned"""
 
     left_list, right_list = [], []
-    with open_input() as inFile:
-        for line_number, line in enumerate(inFile, 1):
-            if not line.strip():
-                # Skip empty lines
-                continue
-
-            match = re.match(r'(\d+)\s+(\d+)', line)
-            if not match:
-                raise ValueError(f"Unexpected format for line {line_number}: {line}")
-            
-            l = int(match.group(1))
-            r = int(match.group(2))
-            bisect.insort(left_list, l)
-            bisect.insort(right_list, r)
-
-        assert len(left_list) == len(right_list)
-        assert len(left_list) != 0
+    for line_number, line in enumerate(input.splitlines(), 1):
+        if not line.strip():
+            # Skip empty lines
+            continue
+
+        match = re.match(r'(\d+)\s+(\d+)', line)
+        if not match:
+            raise ValueError(f"Unexpected format for line {line_number}: {line}")
+        
+        l = int(match.group(1))
+        r = int(match.group(2))
+        bisect.insort(left_list, l)
+        bisect.insort(right_list, r)
+
+    assert len(left_list) == len(right_list)
+    assert len(left_list) != 0
 
     return left_list, right_list
     
 
-left_list, right_list = get_sorted_lists()
-
 def dist_metric(l, r):
     sum_dist = 0
-    for i in range(len(left_list)):
-        dist = left_list[i] - right_list[i]
+    for i in range(len(l)):
+        dist = l[i] - r[i]
         dist = abs(dist)
         sum_dist += dist
 
     return sum_dist
 
-print(f"pt 1: distance = {dist_metric(left_list, right_list)}")
 
 def similarity_metric(l, r):
     d = defaultdict(lambda: 0)
@@ -53,8 +52,27 @@ def similarity_metric(l, r):
 
     return similarity
 
-print(f"pt 2: similarity = {similarity_metric(left_list, right_list)}")
+
+def parse(input: str) -> tuple[list[int], list[int]]:
+    return get_sorted_lists(input)
+
+
+def part1(lists: tuple[list[int], list[int]]) -> int:
+    return dist_metric(*lists)
+
+
+def part2(lists: tuple[list[int], list[int]]) -> int:
+    return similarity_metric(*lists)
+
+
+def main():
+    lists = parse(read_input(YEAR, DAY))
+    print(f"pt 1: distance = {part1(lists)}")
+    print(f"pt 2: similarity = {part2(lists)}")
+
+if __name__ == '__main__':
+    main()
 
 # output (correct):
 # pt 1: distance = 2344935
-# pt 2: similarity = 27647262
\ No newline at end of file
+# pt 2: similarity = 27647262
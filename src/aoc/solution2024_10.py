@@ -1,72 +1,109 @@
 from __future__ import annotations
 
-from collections import defaultdict, deque, namedtuple
-from dataclasses import dataclass, field
+from collections import defaultdict, namedtuple
+from dataclasses import dataclass
+from grid import PaddedGrid
 import heapq
-from input import open_input
-from typing import Mapping
+from input import read_input
+from itertools import batched
+from typing import Iterator, Mapping
+
+try:
+    import numpy as np
+except ImportError:
+    # the numpy engine is optional
+    np = None
+
+YEAR = 2024
+DAY = 10
 
 Dim = namedtuple('Dim', ['row', 'col'])
 TrailScores = dict[Dim, int]
 TRAILHEAD_LEVEL = 0
 PEAK_LEVEL = 9
+ZERO = ord('0')
+# peaks propagated together by find_trails_bitsets
+BITSET_BATCH = 256
 
 @dataclass
 class Map():
     dim: Dim
-    repr: list[list[int]] = field(default_factory=list)
+    # heights as ASCII digits. The padding never follows any height on a trail,
+    # so neighbors need no bounds checks
+    grid: PaddedGrid
 
     def from_str(input: str) -> Map:
-        # todo check input matches regex \d+
-        lines = input.splitlines()
-        assert len(lines) > 0, f"Expected input to have at least 1 line, was {len(lines)}"
-        # todo check all rows are the same length
+        return Map.from_bytes(input.encode('ascii'))
+
 
-        return Map(
-            dim=Dim(len(lines), len(lines[0])),
-            repr=[[int(c) for c in line] for line in lines])
+    def from_bytes(buf) -> Map:
+        # todo check input matches regex \d+
+        grid = PaddedGrid.from_bytes(buf)
+        return Map(dim=Dim(grid.row_count, grid.col_count), grid=grid)
     
 
     def get(self, pos: Dim) -> int | None:
-        if pos.row < 0 or pos.row >= self.dim.row \
-            or pos.col < 0 or pos.col >= self.dim.col:
+        if not self.grid.in_bounds(pos.row, pos.col):
             return None
-        return self.repr[pos.row][pos.col]
+        return self.grid.cells[self.grid.index(pos.row, pos.col)] - ZERO
 
     def level_positions(self, level) -> list[Dim]:
         """Returns a list of (row, col) indices where the value at that position
         is the topographic level
         """
-        return [Dim(row, col) 
-                for row in range(self.dim.row) 
-                for col in range(self.dim.col) 
-                if self.repr[row][col] == level]
-
-
-    def _get_neighbors(self, curr: Dim) -> list[Dim]:
-        curr_val = self.get(curr)
-        if curr_val is None:
-            return []
-
-        neighbors = [
-            # only the non-diagonal neighbors are considered
-            Dim(curr.row - 1, curr.col),
-            Dim(curr.row + 1, curr.col),
-            Dim(curr.row, curr.col - 1),
-            Dim(curr.row, curr.col + 1),
-        ]
-        return [n for n in neighbors
-                if (n_val := self.get(n)) is not None and n_val == curr_val + 1]
+        return [self._to_dim(i) for i in self._level_indices(level)]
+
+
+    def _level_indices(self, level) -> list[int]:
+        return self.grid.find_all(ZERO + level)
+
+
+    def _to_dim(self, i: int) -> Dim:
+        return Dim(*self.grid.position(i))
+
+
+    def _get_neighbors(self, curr: int) -> list[int]:
+        """Flat indices of the neighbors of a flat index one level higher"""
+        cells = self.grid.cells
+        next_val = cells[curr] + 1
+        # only the non-diagonal neighbors are considered
+        return [n for offset in self.grid.offsets() if cells[n := curr + offset] == next_val]
     
 
-    def find_trails(self, count_all_paths = False) -> TrailScores:
-        """Finds all trailheads and scores them by the number of reachable peaks"""
-        trailheads = self.level_positions(TRAILHEAD_LEVEL)
-        peaks = set(self.level_positions(PEAK_LEVEL))
+    def find_trails(self, count_all_paths = False, engine = 'dfs') -> TrailScores:
+        """Finds all trailheads and scores them by the number of reachable peaks,
+        or by the number of trails to them if count_all_paths.
+        engine is 'dfs', 'dp', 'bfs' or 'bitsets' (scores only), or 'numpy' (trail counts only)."""
+        match engine:
+            case 'dfs':
+                pass
+            case 'dp':
+                return self.find_trails_dp(count_all_paths)
+            case 'bfs':
+                if count_all_paths:
+                    raise ValueError("The bfs engine only scores reachable peaks")
+                return self.find_trails_bfs()
+            case 'bitsets':
+                if count_all_paths:
+                    raise ValueError("The bitsets engine only scores reachable peaks")
+                return self.find_trails_bitsets()
+            case 'numpy':
+                if np is None:
+                    raise ValueError("The numpy engine requires numpy to be installed")
+                if not count_all_paths:
+                    raise ValueError("The numpy engine only counts all paths")
+                return self.find_trails_numpy()
+            case _:
+                raise ValueError(f"Unknown engine {engine}")
+
+        trailheads = self._level_indices(TRAILHEAD_LEVEL)
+        cells = self.grid.cells
+        offsets = self.grid.offsets()
+        peak = ZERO + PEAK_LEVEL
 
         result: dict[Dim, int] = dict()
-        q: deque[Dim] = deque()
-        found_peaks: set[Dim] = set()
+        q: list[int] = []
+        found_peaks: set[int] = set()
         for th in trailheads:
             # reset iteration vars
             trails = 0
@@ -80,7 +117,8 @@ class Map():
             while len(q) > 0:
                 # consider next position
                 curr = q.pop()
-                if curr in peaks:  
+                curr_val = cells[curr]
+                if curr_val == peak:
                     if curr in found_peaks and not count_all_paths:
                         continue
                     # we found a peak, add the trail count
@@ -89,29 +127,180 @@ class Map():
                     continue
                 
                 # add all neighbors that follow the trail rule
-                for n in self._get_neighbors(curr):
-                    q.append(n)
+                for offset in offsets:
+                    if cells[curr + offset] == curr_val + 1:
+                        q.append(curr + offset)
             
             # process result
-            result[th] = trails
+            result[self._to_dim(th)] = trails
         return result
 
     
+    def trail_dp(self) -> tuple[dict[int, int], dict[int, int]]:
+        """Counts trails level by level, from the peaks down to the trailheads.
+
+        Every cell on a trail gets its rating (the number of trails from it to a peak) and the
+        set of peaks it reaches, as a bitset with one bit per peak. Both are sums and unions
+        over the neighbors one level up, so each cell is computed once, however many trailheads
+        share it. Only the level above is kept while computing a level.
+        Returns: (ratings, reachable peaks) of the trailheads by flat index. Trailheads that
+        don't reach a peak are left out.
+        """
+        cells = self.grid.cells
+        offsets = self.grid.offsets()
+
+        peaks = self._level_indices(PEAK_LEVEL)
+        ratings = dict.fromkeys(peaks, 1)
+        reachable = {p: 1 << bit for bit, p in enumerate(peaks)}
+        for level in range(PEAK_LEVEL - 1, TRAILHEAD_LEVEL - 1, -1):
+            up_ratings, up_reachable = ratings, reachable
+            ratings, reachable = {}, {}
+            for i in self._level_indices(level):
+                rating = 0
+                peak_set = 0
+                for offset in offsets:
+                    # cells missing from the level above don't lead to a peak
+                    if (up := up_ratings.get(i + offset)) is not None:
+                        rating += up
+                        peak_set |= up_reachable[i + offset]
+                if rating:
+                    ratings[i] = rating
+                    reachable[i] = peak_set
+
+        return ratings, reachable
+
+
+    def find_trails_dp(self, count_all_paths = False) -> TrailScores:
+        """Scores all trailheads like find_trails, from trail_dp"""
+        ratings, reachable = self.trail_dp()
+        return {self._to_dim(th): ratings.get(th, 0) if count_all_paths else reachable.get(th, 0).bit_count()
+                for th in self._level_indices(TRAILHEAD_LEVEL)}
+
+
+    def trailhead_bitsets(self, batch_bits = BITSET_BATCH) -> Iterator[dict[int, int]]:
+        """Propagates reachable peaks down to the trailheads as bitsets, in batches of peaks.
+
+        Peaks are taken in batches of batch_bits in row-major order, and each peak in a batch
+        gets one bit. The batch's bitsets are propagated down from the peaks a level at a time,
+        ORed together where trails meet. Trails only descend 9 levels, so a batch only ever
+        touches the cells within 9 steps of its peaks. That keeps memory bounded by the batch
+        size rather than the map size, and neighboring peaks in a batch share most of those cells.
+        Yields: for each batch, the bitsets of the peaks each trailhead reaches, by flat index
+        """
+        cells = self.grid.cells
+        offsets = self.grid.offsets()
+
+        for batch in batched(self.grid.iter_find(ZERO + PEAK_LEVEL), batch_bits):
+            frontier = {p: 1 << bit for bit, p in enumerate(batch)}
+            for level in range(PEAK_LEVEL - 1, TRAILHEAD_LEVEL - 1, -1):
+                height = ZERO + level
+                below: dict[int, int] = {}
+                for i, peak_set in frontier.items():
+                    for offset in offsets:
+                        if cells[n := i + offset] == height:
+                            below[n] = below.get(n, 0) | peak_set
+                frontier = below
+            yield frontier
+
+
+    def find_trails_bitsets(self, batch_bits = BITSET_BATCH) -> TrailScores:
+        """Scores all trailheads by the number of reachable peaks, like find_trails.
+        A trailhead's score is the popcount of its bitsets over all batches."""
+        scores = dict.fromkeys(self._level_indices(TRAILHEAD_LEVEL), 0)
+        for trailheads in self.trailhead_bitsets(batch_bits):
+            for th, peak_set in trailheads.items():
+                scores[th] += peak_set.bit_count()
+
+        return {self._to_dim(th): score for th, score in scores.items()}
+
+
+    def sum_scores_bitsets(self, batch_bits = BITSET_BATCH) -> int:
+        """Sum of all trailhead scores, without holding a score per trailhead"""
+        return sum(peak_set.bit_count()
+                   for trailheads in self.trailhead_bitsets(batch_bits)
+                   for peak_set in trailheads.values())
+
+
+    def ratings_numpy(self) -> np.ndarray:
+        """Counts the trails from every cell for a whole level at once.
+
+        The heights are the padded grid as a 2-d uint8 array. A cell's rating is the sum of its
+        neighbors' ratings one level up, and the ratings array only ever holds the level above,
+        so four shifted slices of it added together and masked by the level give the whole next
+        level. The padding is never a height, so the shifted slices never wrap.
+        Returns: the ratings of the trailheads over the padded grid, zero everywhere else
+        """
+        heights = np.frombuffer(self.grid.cells, dtype=np.uint8).reshape(-1, self.grid.stride)
+        # a trailhead has at most 4 ** 9 trails
+        ratings = (heights == ZERO + PEAK_LEVEL).astype(np.int32)
+        summed = np.zeros_like(ratings)
+        for level in range(PEAK_LEVEL - 1, TRAILHEAD_LEVEL - 1, -1):
+            np.add(ratings[:-2, 1:-1], ratings[2:, 1:-1], out=summed[1:-1, 1:-1])
+            summed[1:-1, 1:-1] += ratings[1:-1, :-2]
+            summed[1:-1, 1:-1] += ratings[1:-1, 2:]
+            ratings = np.where(heights == ZERO + level, summed, 0)
+        return ratings
+
+
+    def find_trails_numpy(self) -> TrailScores:
+        """Scores all trailheads by their number of trails, like find_trails(count_all_paths=True)"""
+        ratings = self.ratings_numpy().ravel()
+        return {self._to_dim(th): int(ratings[th]) for th in self._level_indices(TRAILHEAD_LEVEL)}
+
+
+    def sum_ratings_numpy(self) -> int:
+        return int(self.ratings_numpy().sum(dtype=np.int64))
+
+
+    def find_trails_bfs(self, batch_bits = BITSET_BATCH) -> TrailScores:
+        """Scores all trailheads by the number of reachable peaks, like find_trails_dijkstra.
+
+        Every step of a trail climbs exactly one level, so a cell's distance from any trailhead
+        is its height, and a heap has nothing to order. Instead the frontier of one level is
+        expanded into the next for all trailheads together. Each frontier cell carries the set
+        of trailheads that reach it, as a bitset ORed together where trails meet, and a
+        trailhead's score is the number of peaks whose set includes it. Trailheads are taken
+        in batches of batch_bits in row-major order, so the sets stay narrow on big maps.
+        """
+        cells = self.grid.cells
+        offsets = self.grid.offsets()
+        trailheads = self._level_indices(TRAILHEAD_LEVEL)
+
+        scores = [0] * len(trailheads)
+        for batch_start in range(0, len(trailheads), batch_bits):
+            frontier = {th: 1 << bit for bit, th in enumerate(trailheads[batch_start:batch_start + batch_bits])}
+            for level in range(TRAILHEAD_LEVEL + 1, PEAK_LEVEL + 1):
+                height = ZERO + level
+                above: dict[int, int] = {}
+                for i, sources in frontier.items():
+                    for offset in offsets:
+                        if cells[n := i + offset] == height:
+                            above[n] = above.get(n, 0) | sources
+                frontier = above
+
+            for sources in frontier.values():
+                while sources:
+                    lowest = sources & -sources
+                    scores[batch_start + lowest.bit_length() - 1] += 1
+                    sources ^= lowest
+
+        return {self._to_dim(th): score for th, score in zip(trailheads, scores)}
+
+
     def find_trails_dijkstra(self) -> TrailScores:
         """Finds all trailheads and scores them by the number of reachable peaks."""
 
-        trailheads = self.level_positions(TRAILHEAD_LEVEL)
-        peaks = set(self.level_positions(PEAK_LEVEL))
+        trailheads = self._level_indices(TRAILHEAD_LEVEL)
 
         Node = namedtuple('Node', ['dist', 'pos'])
 
         # many-to-many Dijkstra is reducible to running Dijkstra from each source.
-        def dijkstra_from_source(source: Dim) -> set[Dim]:
+        def dijkstra_from_source(source: int) -> set[int]:
             """Run Dijkstra's algorithm from a single source.
             Returns set of all reachable positions."""
             distances = defaultdict(lambda: float('inf'))
             distances[source] = 0
-            visited: set[Pos] = set()
+            visited: set[int] = set()
             # since python tuples use composite value semantics, the natural ordering of
             # distance than position is used for the heap constraint.
             pq = [Node(0, source)]
@@ -133,9 +322,9 @@ class Map():
             
             return visited
         
-        return {th: len([p
-                         for p in dijkstra_from_source(th)
-                         if self.get(p) == PEAK_LEVEL])
+        return {self._to_dim(th): len([p
+                                       for p in dijkstra_from_source(th)
+                                       if self.grid.cells[p] == ZERO + PEAK_LEVEL])
                 for th in trailheads
                 }
         
@@ -148,29 +337,46 @@ class Map():
         return result
         
 
-def setup():
-    global g_map
-    input = """
-89010123
-78121874
-87430965
-96549874
-45678903
-32019012
-01329801
-10456732
-""".strip()
-    with open_input() as f:
-        input = f.read().strip()
-    g_map = Map.from_str(input)
+def count_cells(input: str) -> int:
+    lines = input.splitlines()
+    return len(lines) * len(lines[0])
 
 
-def dfs_find_trails():
-    trails = g_map.find_trails()
+def parse(input: str) -> Map:
+    return Map.from_str(input)
 
 
-def dijkstra_find_trails():
-    trails = g_map.find_trails_dijkstra()
+def parse_bytes(buf) -> Map:
+    """Like parse, for a buffer such as an mmap from input.open_input_mmap"""
+    return Map.from_bytes(buf)
+
+
+def part1(m: Map) -> int:
+    return m.sum_scores_bitsets()
+
+
+def part2(m: Map) -> int:
+    if np is not None:
+        return m.sum_ratings_numpy()
+    return m.sum_trails(m.find_trails_dp(count_all_paths=True))
+
+
+# solver variants measured by bench.py
+BENCHMARKS = {
+    'find_trails': Map.find_trails,
+    'find_trails_all_paths': lambda m: m.find_trails(count_all_paths=True),
+    'find_trails_dijkstra': Map.find_trails_dijkstra,
+    'find_trails_bfs': Map.find_trails_bfs,
+    'find_trails_dp': Map.find_trails_dp,
+    'find_trails_dp_all_paths': lambda m: m.find_trails_dp(count_all_paths=True),
+    'find_trails_bitsets': Map.find_trails_bitsets,
+    'sum_scores_bitsets': Map.sum_scores_bitsets,
+}
+# reported as throughput next to the timings
+BENCHMARK_SIZE = ('cells', count_cells)
+if np is not None:
+    BENCHMARKS['find_trails_numpy'] = Map.find_trails_numpy
+    BENCHMARKS['sum_ratings_numpy'] = Map.sum_ratings_numpy
 
 
 if __name__ == '__main__':
@@ -184,25 +390,13 @@ if __name__ == '__main__':
 01329801
 10456732
 """.strip()
-    with open_input() as f:
-        input = f.read().strip()
+    input = read_input(YEAR, DAY)
     m: Map = Map.from_str(input)
-    # setup()
-    # find_trails()
 
     dfs_trails = m.find_trails(count_all_paths=True)
     # dijkstra_trails = m.find_trails_dijkstra()
     # assert dfs_trails == dijkstra_trails, f"Expected DFS to match Dijkstra. DFS=[{dfs_trails}], Dijkstra=[{dijkstra_trails}]"
     print(f"Sum of trailheads: {m.sum_trails(dfs_trails)}")
 
-    import timeit
-    NUMBER = 10
-    dfs_result = timeit.timeit("m.find_trails()",
-                                globals=locals(), 
-                                number=NUMBER)
-    dijkstra_result = timeit.timeit("m.find_trails_dijkstra()",
-                                globals=locals(), 
-                                number=NUMBER)
-    
-    print(f"DFS time per iteration:\t{dfs_result / NUMBER * 1000:.2f} ms")
-    print(f"Dijkstra time per iteration:\t{dijkstra_result / NUMBER * 1000:.2f} ms")
\ No newline at end of file
+    import bench
+    bench.main(['--day', str(DAY), '--repeat', '10'])
@@ -1,21 +1,21 @@
-from input import open_input
+from input import read_input
 from collections.abc import Callable
 
+YEAR = 2024
+DAY = 2
+
 type Report = list[int]
 
-def get_reports() -> list[Report]:
-    """Open the input file and extract as a list of reports."""
+def get_reports(input: str) -> list[Report]:
+    """Extract the input as a list of reports."""
 
     reports = []
-    with open_input() as in_file:
-        for l in in_file:
-            reports.append([int(level) for level in l.split()])
+    for l in input.splitlines():
+        reports.append([int(level) for level in l.split()])
 
     return reports
 
 
-reports = get_reports()
-
 def classify_level_diff(diff: int, first_gradient: int) -> bool:
     if diff == 0:
         # Levels must be increasing or decreasing 
@@ -59,8 +59,6 @@ def count_safe(rs: list[Report], classifier: Callable[[Report], bool]) -> int:
     return cnt
 
 
-print(f"pt 1: safe reports = {count_safe(reports, classify_pt1)}")
-
 def classify_pt2(report: Report) -> bool:
 
     first_gradient = report[1] - report[0]
@@ -84,8 +82,27 @@ def classify_pt2(report: Report) -> bool:
         
     return False
 
-print(f"pt 2: safe reports = {count_safe(reports, classify_pt2)}")
+
+def parse(input: str) -> list[Report]:
+    return get_reports(input)
+
+
+def part1(reports: list[Report]) -> int:
+    return count_safe(reports, classify_pt1)
+
+
+def part2(reports: list[Report]) -> int:
+    return count_safe(reports, classify_pt2)
+
+
+def main():
+    reports = parse(read_input(YEAR, DAY))
+    print(f"pt 1: safe reports = {part1(reports)}")
+    print(f"pt 2: safe reports = {part2(reports)}")
+
+if __name__ == '__main__':
+    main()
 
 # output (correct):
 # pt 1: safe reports = 585
-# pt 2: safe reports = 626
\ No newline at end of file
+# pt 2: safe reports = 626
@@ -1,10 +1,9 @@
-from input import open_input
+from input import read_input, strip
 import re
 import sys
 
-mem_raw = ""
-with open_input() as f:
-    mem_raw = f.read()
+YEAR = 2024
+DAY = 3
 
 valid_mul_pattern = re.compile(r'mul\((\d{1,3}),(\d{1,3})\)')
 
@@ -33,10 +32,6 @@ def compute_valid(mul_inputs: list[MulInput]) -> int:
     return sum
 
 
-mul_inputs = get_mul_inputs(mem_raw)
-print(f"pt 1: sum of valid muls: {compute_valid(mul_inputs)}")
-
-
 def get_dos(s: str) -> Positions:
     """Gets the indices of the start of all `do()` commands in the raw memory input"""
     return [m.start() for m in re.finditer(r'do\(\)',s)]
@@ -74,7 +69,33 @@ def compute_valid_pt2(mul_inputs: list[MulInput], dos: Positions, donts: Positio
     return sum
 
 
-print(f"pt 2: sum of muls: {compute_valid_pt2(mul_inputs, get_dos(mem_raw), get_donts(mem_raw))}")
+def parse(input: str) -> str:
+    # the raw memory is searched directly by each part
+    return input
+
+
+def parse_bytes(buf) -> str:
+    """Like parse, for a buffer such as an mmap from input.open_input_mmap.
+    The regexes search str, so the memory is decoded once here."""
+    with strip(buf) as view:
+        return parse(str(view, 'ascii'))
+
+
+def part1(mem_raw: str) -> int:
+    return compute_valid(get_mul_inputs(mem_raw))
+
+
+def part2(mem_raw: str) -> int:
+    return compute_valid_pt2(get_mul_inputs(mem_raw), get_dos(mem_raw), get_donts(mem_raw))
+
+
+def main():
+    mem_raw = parse(read_input(YEAR, DAY))
+    print(f"pt 1: sum of valid muls: {part1(mem_raw)}")
+    print(f"pt 2: sum of muls: {part2(mem_raw)}")
+
+if __name__ == '__main__':
+    main()
 
 # output (correct):
 # pt 1: sum of valid muls: 171183089
@@ -1,13 +1,12 @@
-from input import open_input
-from collections import defaultdict, OrderedDict
-from itertools import product
+from input import read_input, strip
+from collections import defaultdict, deque, OrderedDict
+from grid import ALL_DIRECTIONS, PaddedGrid
 
 import regex
 import sys
 
-word_search = ""
-with open_input() as f:
-    word_search = f.read().strip()
+YEAR = 2024
+DAY = 4
 
 def get_width(ws: str) -> int:
     lines = ws.splitlines()
@@ -18,7 +17,6 @@ def get_width(ws: str) -> int:
         
     return first_line_len
 
-line_width = get_width(word_search)
 
 def strip_newlines(ws: str) -> str:
     return regex.compile(r'\n|\r').sub('', ws)
@@ -27,7 +25,7 @@ def strip_newlines(ws: str) -> str:
 type NamedPatterns = dict[str, str|regex.Pattern]
 
 
-def build_skip_col(offset: int, newlines_are_stripped=True) -> str:
+def build_skip_col(line_width: int, offset: int, newlines_are_stripped=True) -> str:
     """Builds a pattern the skips 1 col down, plus an offset (which may be negative)."""
     
     # if newlines are stripped, skipping line_width will skip the char 1 row down 
@@ -35,7 +33,7 @@ def build_skip_col(offset: int, newlines_are_stripped=True) -> str:
     return r'.{' + f"{line_width - 1 + offset}" + '}' 
 
 
-def build_patterns() -> NamedPatterns:
+def build_patterns(line_width: int) -> NamedPatterns:
     """Line width is the width without carriage returns or newlines."""
     forward_seq = ['X', 'M', 'A', 'S']      # sequence of chars in XMAS forwards
     backward_seq = ['S', 'A', 'M', 'X']     # sequence of chars in XMAS backwards
@@ -45,20 +43,16 @@ def build_patterns() -> NamedPatterns:
     return {
         'forward': ''.join(forward_seq),
         'backward': ''.join(backward_seq),
-        'down': build_skip_col(0).join(forward_seq),
-        'up': build_skip_col(0).join(backward_seq),
-        'down_right': build_skip_col(+1).join(forward_seq),
-        'down_left': build_skip_col(-1).join(forward_seq),
-        'up_right': build_skip_col(-1).join(backward_seq),
-        'up_left': build_skip_col(+1).join(backward_seq),
+        'down': build_skip_col(line_width, 0).join(forward_seq),
+        'up': build_skip_col(line_width, 0).join(backward_seq),
+        'down_right': build_skip_col(line_width, +1).join(forward_seq),
+        'down_left': build_skip_col(line_width, -1).join(forward_seq),
+        'up_right': build_skip_col(line_width, -1).join(backward_seq),
+        'up_left': build_skip_col(line_width, +1).join(backward_seq),
     }
     
 
-patterns = build_patterns()
-
-print(f"debug: line_width=[{line_width}], patterns=[{patterns}]")
-
-def count_matches(ws: str, patterns: NamedPatterns) -> int:
+def count_matches(ws: str, patterns: NamedPatterns, verbose = False) -> int:
     count = 0
     for name, pattern in patterns.items():
         matches_for_pattern = 0
@@ -66,24 +60,164 @@ def count_matches(ws: str, patterns: NamedPatterns) -> int:
         for m in regex.finditer(pattern, ws, overlapped=True, flags=regex.DOTALL):
             matches_for_pattern += 1
             # print(f"{m.span()}")
-        print(f"found {matches_for_pattern} matches for {name}")
+        if verbose:
+            print(f"found {matches_for_pattern} matches for {name}")
         count += matches_for_pattern
 
     return count
 
 
-def fuglede_solution_pt1(ws: str):
+# (row, col) steps of each direction a word can be read in, by their names in the debug output
+DIRECTION_NAMES = OrderedDict([
+    ((0, 1), "forward"),
+    ((0, -1), "backward"),
+    ((1, 0), "down"),
+    ((-1, 0), "up"),
+    ((1, 1), "down_right"),
+    ((1, -1), "down_left"),
+    ((-1, 1), "up_right"),
+    ((-1, -1), "up_left"),
+    ])
+
+
+def count_word_by_direction(ws: str, word: str) -> dict[str, int]:
+    """Counts the occurrences of word in the word search in each direction, by direction name.
+
+    The word search is a flat buffer padded by len(word) - 1 on every side, so a word can't
+    continue from the end of one row onto the next. In a direction with flat step s, the k-th
+    letters of all candidates are the slice of the buffer shifted by k * s. Each shifted slice
+    is translated to one byte per cell, 1 where it has the word's k-th letter, and read as a
+    single int. ANDing them leaves a set bit for each match, so every pass over the buffer is
+    one C-level operation, whatever the size of the grid.
+    """
+    letters = word.encode('ascii')
+    if len(letters) == 0:
+        raise ValueError("Expected a word with at least one letter")
+    board = PaddedGrid.from_str(ws.strip(), pad=len(letters) - 1)
+    cells = bytes(board.cells)
+    is_letter = {letter: bytes(1 if b == letter else 0 for b in range(256)) for letter in set(letters)}
+
+    counts = {}
+    for direction, step in zip(DIRECTION_NAMES, board.offsets(DIRECTION_NAMES)):
+        reach = [k * step for k in range(len(letters))]
+        # start of the first candidate and end of the last whose letters are all in the buffer
+        start, end = -min(reach), len(cells) - max(reach)
+        matches = -1
+        for k, letter in enumerate(letters):
+            shifted = cells[start + reach[k]:end + reach[k]].translate(is_letter[letter])
+            matches &= int.from_bytes(shifted, 'little')
+        counts[DIRECTION_NAMES[direction]] = matches.bit_count()
+    return counts
+
+
+def count_word(ws: str, word: str) -> int:
+    return sum(count_word_by_direction(ws, word).values())
+
+
+class AhoCorasick():
+    """An automaton that finds every occurrence of any of a set of patterns in one pass over a text.
+
+    It's a trie of the patterns, where every state also knows the state of the longest proper
+    suffix of its path that's in the trie (its fail link). Following fail links for characters
+    missing from the trie is folded into a full transition table, so each character of the text
+    is one table lookup however many patterns there are. The table is over a compact alphabet
+    of the characters in the patterns, plus one class for every other byte.
+    """
+
+    def __init__(self, patterns: list[bytes]):
+        # class 0 is every byte in none of the patterns
+        letters = sorted(set(b''.join(patterns)))
+        self.classes = bytes(letters.index(b) + 1 if b in letters else 0 for b in range(256))
+        alphabet = len(letters) + 1
+
+        # trie, where -1 is a missing edge
+        delta: list[list[int]] = [[-1] * alphabet]
+        # indices of the patterns ending at each state
+        outputs: list[list[int]] = [[]]
+        for pattern_i, pattern in enumerate(patterns):
+            state = 0
+            for c in pattern.translate(self.classes):
+                if delta[state][c] == -1:
+                    delta[state][c] = len(delta)
+                    delta.append([-1] * alphabet)
+                    outputs.append([])
+                state = delta[state][c]
+            outputs[state].append(pattern_i)
+
+        # breadth first, so fail links always point at finished states
+        fail = [0] * len(delta)
+        queue = deque()
+        for c in range(alphabet):
+            if delta[0][c] == -1:
+                delta[0][c] = 0
+            else:
+                queue.append(delta[0][c])
+        while queue:
+            state = queue.popleft()
+            outputs[state] += outputs[fail[state]]
+            for c in range(alphabet):
+                child = delta[state][c]
+                if child == -1:
+                    delta[state][c] = delta[fail[state]][c]
+                else:
+                    fail[child] = delta[fail[state]][c]
+                    queue.append(child)
+
+        self.delta = delta
+        self.outputs = outputs
+        self.pattern_count = len(patterns)
+
+
+    def count(self, text: bytes, counts: list[int] | None = None) -> list[int]:
+        """Adds the number of occurrences of each pattern in text to counts, by pattern index."""
+        if counts is None:
+            counts = [0] * self.pattern_count
+        delta, outputs = self.delta, self.outputs
+        state = 0
+        for c in text.translate(self.classes):
+            state = delta[state][c]
+            for pattern_i in outputs[state]:
+                counts[pattern_i] += 1
+        return counts
+
+
+def count_words(ws: str, words: list[str]) -> dict[str, int]:
+    """Counts the occurrences of each word in the word search in all 8 directions, like count_word,
+    streaming the rows, columns and both diagonals through one Aho-Corasick automaton.
+
+    Each word is searched for forwards and reversed, so every line only needs reading one way.
+    With one column of padding, a line family is a handful of strided slices of the flat buffer:
+    step 1 is every row, and steps of stride, stride + 1 and stride - 1 starting from each cell of
+    the first row are the columns and diagonals. A padding byte matches no word, so words can't
+    run from one line into the next. That reads every cell 4 times whatever the number of words.
+    """
+    if not words or not all(words):
+        raise ValueError("Expected at least one word, and every word to have at least one letter")
+    board = PaddedGrid.from_str(ws.strip())
+    cells = bytes(board.cells)
+    stride = board.stride
+
+    # pattern 2 * i is word i forwards, 2 * i + 1 is word i reversed
+    encoded = [word.encode('ascii') for word in words]
+    automaton = AhoCorasick([p for word in encoded for p in (word, word[::-1])])
+    counts = automaton.count(cells)
+    for step in (stride, stride + 1, stride - 1):
+        for start in range(step):
+            automaton.count(cells[start::step], counts)
+
+    return {word: counts[2 * i] + counts[2 * i + 1] for i, word in enumerate(words)}
+
+
+def fuglede_solution_pt1(ws: str) -> int:
     """ws is assumed to be the raw input as a string
-    Copied from https://github.com/fuglede/adventofcode/blob/master/2024/day04/solutions.py
-    for debugging purposes."""
-    ls = ws.strip().splitlines()
-    
-    # holds a map of index to char for each item in the word map
-    boardz = defaultdict(str) 
-    # real part is the row, imag is the col
-    boardz |= {i + 1j * j: x for i, l in enumerate(ls) for j, x in enumerate(l)}
-    # set of basis vectors for valid directions. (0,0) will never produce XMAS because XMAS has different letters
-    octdir = {i + 1j * j for (i, j) in set(product((-1, 0, 1), (-1, 0, 1))) - {(0, 0)}}
+    Ported from https://github.com/fuglede/adventofcode/blob/master/2024/day04/solutions.py
+    for debugging purposes. The original looks words up in a dict of complex positions,
+    kept in the comments below; this port does the same scan over a PaddedGrid."""
+    # holds the word map as a flat buffer. The padding is as wide as XMAS reaches past its
+    # first letter, so no direction needs bounds checks
+    word = b"XMAS"
+    board = PaddedGrid.from_str(ws.strip(), pad=len(word) - 1)
+    cells = board.cells
 
     # original solution. break apart for debugging
     # Part 1
@@ -95,41 +229,30 @@ def fuglede_solution_pt1(ws: str):
     #     )
     # )
     count_by_basis = defaultdict(int)
-    for z in list(boardz.keys()):
-        for dz in octdir:
-            # offset from position z by 0..3 * the basis vector
-            if [boardz[z + i * dz] for i in range(4)] == ["X", "M", "A", "S"]:
+    starts = board.find_all(word[0])
+    # every direction except (0, 0), which never produces XMAS because XMAS has different letters
+    for dz, step in zip(ALL_DIRECTIONS, board.offsets(ALL_DIRECTIONS)):
+        for z in starts:
+            # offset from position z by 1..3 * the basis vector
+            if all(cells[z + i * step] == word[i] for i in range(1, len(word))):
                 count_by_basis[dz] += 1
     
-    human_readable_basis = OrderedDict([
-        (0+1j, "forward"),
-        (0-1j, "backward"),
-        (1+0j, "down"),
-        (-1+0j, "up"),
-        (1+1j, "down_right"),
-        (1-1j, "down_left"),
-        (-1+1j, "up_right"),
-        (-1-1j, "up_left"),
-        ])
     count = 0 
-    for dz, human_readable_name in human_readable_basis.items():
+    for dz, human_readable_name in DIRECTION_NAMES.items():
         print(f"found {count_by_basis[dz]} matches for {human_readable_name}")
         count += count_by_basis[dz]
     print(f"found {count} xmas")
+    return count
 
 
-print(f"pt 1: XMAS found: {count_matches(strip_newlines(word_search), patterns)}")
-print("debugging with alternate solution:")
-fuglede_solution_pt1(word_search)
-
-def build_patterns_pt2() -> NamedPatterns:
+def build_patterns_pt2(line_width: int) -> NamedPatterns:
     non_newline_pattern = r'[^\n]'
     # the direction is the arrow from Ms to Ss
     def build_x_mas(corners: tuple[str, str, str, str]) -> str:
         """Builds a pattern matching the x-mas from the four corners starting top-left
         and proceeding clockwise"""
-        return corners[0] + non_newline_pattern + corners[1] + build_skip_col(-1, False) + \
-        non_newline_pattern + 'A' + build_skip_col(0, False) + \
+        return corners[0] + non_newline_pattern + corners[1] + build_skip_col(line_width, -1, False) + \
+        non_newline_pattern + 'A' + build_skip_col(line_width, 0, False) + \
         corners[3] + non_newline_pattern + corners[2]
 
     right = build_x_mas(('M', 'S', 'S', 'M'))
@@ -145,8 +268,62 @@ def build_patterns_pt2() -> NamedPatterns:
     }
 
 
-patterns_pt2 = build_patterns_pt2()
-print(f"x-mas patterns: {patterns_pt2}")
-print(f"pt 2: X-MAS found: {count_matches(word_search, patterns_pt2)}")
+def parse(input: str) -> str:
+    # validates the word search is rectangular
+    get_width(input)
+    return input
+
+
+def parse_bytes(buf) -> str:
+    """Like parse, for a buffer such as an mmap from input.open_input_mmap.
+    The regex patterns search str, so the word search is decoded once here."""
+    with strip(buf) as view:
+        return parse(str(view, 'ascii'))
+
+
+def part1_regex(word_search: str, verbose = False) -> int:
+    """The first attempt at part 1, which overcounts words that wrap from one line to the next"""
+    patterns = build_patterns(get_width(word_search))
+    if verbose:
+        print(f"debug: line_width=[{get_width(word_search)}], patterns=[{patterns}]")
+    return count_matches(strip_newlines(word_search), patterns, verbose)
+
+
+def part1(word_search: str, verbose = False) -> int:
+    counts = count_word_by_direction(word_search, "XMAS")
+    if verbose:
+        for direction, count in counts.items():
+            print(f"found {count} matches for {direction}")
+    return sum(counts.values())
+
+
+def part2(word_search: str, verbose = False) -> int:
+    patterns_pt2 = build_patterns_pt2(get_width(word_search))
+    if verbose:
+        print(f"x-mas patterns: {patterns_pt2}")
+    return count_matches(word_search, patterns_pt2, verbose)
+
+
+# a bigger set of words, to show count_words doesn't slow down with more of them
+DICTIONARY = ["XMAS", "MAS", "SAM", "AXMAS", "MASSA", "SAMAX", "AXAS", "MAXAM", "SMAX", "XAM", "AMASS", "MASAX"]
+
+# solver variants measured by bench.py
+BENCHMARKS = {
+    'part1_regex': part1_regex,
+    'count_word_by_direction': lambda ws: count_word_by_direction(ws, "XMAS"),
+    'count_words': lambda ws: count_words(ws, ["XMAS"]),
+    'count_words_dictionary': lambda ws: count_words(ws, DICTIONARY),
+    'part2': part2,
+}
+
+
+def main():
+    word_search = parse(read_input(YEAR, DAY))
+    print(f"pt 1: XMAS found: {part1(word_search, verbose=True)}")
+    print("debugging with alternate solution:")
+    fuglede_solution_pt1(word_search)
+    print(f"pt 2: X-MAS found: {part2(word_search, verbose=True)}")
 
+if __name__ == '__main__':
+    main()
 
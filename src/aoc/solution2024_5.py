@@ -1,10 +1,9 @@
-from input import open_input
+from input import read_input
 from collections import defaultdict, deque, namedtuple
 from typing import Sequence, DefaultDict, Set, Iterable, Mapping, Optional
 
-input = ""
-with open_input(filename="input.txt") as f:
-    input = f.read().strip()
+YEAR = 2024
+DAY = 5
 
 ## solution generated from claude
 
@@ -227,8 +226,29 @@ def sum_middle(updates: Updates) -> int:
     return sum
 
 
-valid, corrections = validate_updates(input.splitlines())
-solution_pt1 = sum_middle(valid)
-solution_pt2 = sum_middle([c.corrected for c in corrections])
-print(f"Valid updates are: {solution_pt1}")
-print(f"Sum of corrected updates are: {solution_pt2}")
\ No newline at end of file
+def parse(input: str) -> tuple[DependencyGraph, Updates]:
+    rules, updates = parse_input(input.splitlines())
+    return build_dependency_graph(rules), updates
+
+
+def part1(parsed: tuple[DependencyGraph, Updates]) -> int:
+    graph, updates = parsed
+    return sum_middle([u for u in updates if is_valid_order(u, graph)])
+
+
+def part2(parsed: tuple[DependencyGraph, Updates]) -> int:
+    graph, updates = parsed
+    corrections = [correct_invalid_update(u, graph) for u in updates if not is_valid_order(u, graph)]
+    return sum_middle([c.corrected for c in corrections if c])
+
+
+def main():
+    input = read_input(YEAR, DAY)
+    valid, corrections = validate_updates(input.splitlines())
+    solution_pt1 = sum_middle(valid)
+    solution_pt2 = sum_middle([c.corrected for c in corrections])
+    print(f"Valid updates are: {solution_pt1}")
+    print(f"Sum of corrected updates are: {solution_pt2}")
+
+if __name__ == '__main__':
+    main()
@@ -1,14 +1,19 @@
 # allows self-referential member annotations
 from __future__ import annotations
 
-from input import open_input
+from input import read_input
+from array import array
+from concurrent.futures import ProcessPoolExecutor
 from enum import Enum, StrEnum
+from multiprocessing.shared_memory import SharedMemory
 from numbers import Complex
 from dataclasses import dataclass
+from grid import PADDING, PaddedGrid
+import os
+import re
 
-input = ""
-with open_input(filename="input.txt") as f:
-    input = f.read().strip()
+YEAR = 2024
+DAY = 6
 
 """
 the paths are chaotic (large differences from small initial condition changes),
@@ -81,22 +86,43 @@ class MapLabel(StrEnum):
             }
 
 
-type GridRepr = dict[Complex, MapLabel]
+"""
+the dict of complex positions costs a hashed key and a pointer per cell, and copying the
+grid for every trial copies all of them. MapLabels are single characters, so the grid can
+be a bytearray of them instead: one byte per cell, indexed row-major, and copied with a slice.
+The grid is padded, so the guard leaving is just stepping onto padding.
+"""
+
+# MapLabel by byte value, for reading cells without an enum lookup
+LABELS: list[MapLabel | None] = [None] * 128
+for label in MapLabel:
+    LABELS[ord(label)] = label
+# guard_pos once the guard has left the grid
+OFF_GRID = -1
 
 
 @dataclass
 class Grid():
-    repr: GridRepr
-    guard_pos: Complex
-    row_count: int
-    col_count: int
+    # one MapLabel character per cell
+    cells: PaddedGrid
+    guard_pos: int
+
+    @property
+    def row_count(self) -> int:
+        return self.cells.row_count
+
+
+    @property
+    def col_count(self) -> int:
+        return self.cells.col_count
+
 
     def __str__(self) -> str:
-        return '\n'.join([''.join([self.repr[row + 1j * col] for col in range(self.col_count)]) for row in range(self.row_count)])
+        return str(self.cells)
 
 
     def copy(self) -> Grid:
-        return Grid(self.repr.copy(), self.guard_pos, self.row_count, self.col_count)
+        return Grid(self.cells.copy(), self.guard_pos)
 
 
     class NextResult(Enum):
@@ -108,8 +134,21 @@ class Grid():
         LOOP_FOUND = 5
 
 
-    def pos_to_str(pos: Complex) -> str:
-        return f"row {int(pos.real)}, col {int(pos.imag)}"
+    def pos_to_str(self, pos: int) -> str:
+        row, col = self.cells.position(pos)
+        return f"row {row}, col {col}"
+
+
+    def to_pos(self, row: int, col: int) -> int:
+        return self.cells.index(row, col)
+
+
+    def label(self, pos: int) -> MapLabel:
+        return LABELS[self.cells.cells[pos]]
+
+
+    def mark(self, pos: int, label: MapLabel):
+        self.cells.cells[pos] = ord(label)
 
 
     def next(self, count_traversals: bool = False) -> tuple[Grid, NextResult]:
@@ -117,97 +156,91 @@ class Grid():
         Callers should check the result is in bounds after this call to determine
         whether subsequent calls to next will modify the grid.
         """
-        curr = self.repr[self.guard_pos]
-        assert curr.is_guard(), f"Expected a guard character at {Grid.pos_to_str(self.guard_pos)}, was {curr}"
-
-        next_pos = self.guard_pos + curr.step()
-        if not self.pos_in_bounds(next_pos):
-            # Don't insert new entries outside the bounds of the grid
-            self.repr[self.guard_pos] = MapLabel.TRAVERSED
-            self.guard_pos = next_pos
+        curr = self.label(self.guard_pos)
+        assert curr.is_guard(), f"Expected a guard character at {self.pos_to_str(self.guard_pos)}, was {curr}"
+
+        step = curr.step()
+        next_pos = self.guard_pos + int(step.real) * self.cells.stride + int(step.imag)
+        if self.cells.cells[next_pos] == self.cells.fill:
+            # Don't write outside the bounds of the grid
+            self.mark(self.guard_pos, MapLabel.TRAVERSED)
+            self.guard_pos = OFF_GRID
             return self, Grid.NextResult.OOB
         
         result = Grid.NextResult.INVALID
-        match self.repr[next_pos]:
+        match self.label(next_pos):
             case MapLabel.EMPTY:
                 # Continue travelling in the same direction
-                self.repr[next_pos] = curr
-                self.repr[self.guard_pos] = MapLabel.TRAVERSED if not count_traversals else MapLabel.TRAVERSED_ONE
+                self.mark(next_pos, curr)
+                self.mark(self.guard_pos, MapLabel.TRAVERSED if not count_traversals else MapLabel.TRAVERSED_ONE)
                 self.guard_pos = next_pos
                 result = Grid.NextResult.STEP
             case MapLabel.TRAVERSED:
                 # Continue travelling in the same direction, but don't say it's a new step
-                self.repr[next_pos] = curr
-                self.repr[self.guard_pos] = MapLabel.TRAVERSED
+                self.mark(next_pos, curr)
+                self.mark(self.guard_pos, MapLabel.TRAVERSED)
                 self.guard_pos = next_pos
                 result = Grid.NextResult.STEP_PREV_TRAVERSED
             case MapLabel.TRAVERSED_ONE:
                 # Same as above, but increment
-                self.repr[next_pos] = curr
-                self.repr[self.guard_pos] = MapLabel.TRAVERSED_TWO
+                self.mark(next_pos, curr)
+                self.mark(self.guard_pos, MapLabel.TRAVERSED_TWO)
                 self.guard_pos = next_pos
                 result = Grid.NextResult.STEP_PREV_TRAVERSED
             case MapLabel.TRAVERSED_TWO:
                 # Same as above, but increment
-                self.repr[next_pos] = curr
-                self.repr[self.guard_pos] = MapLabel.TRAVERSED_THREE
+                self.mark(next_pos, curr)
+                self.mark(self.guard_pos, MapLabel.TRAVERSED_THREE)
                 self.guard_pos = next_pos
                 result = Grid.NextResult.STEP_PREV_TRAVERSED
             case MapLabel.TRAVERSED_THREE:
                 # Same as above, but increment
-                self.repr[next_pos] = curr
-                self.repr[self.guard_pos] = MapLabel.TRAVERSED_FOUR
+                self.mark(next_pos, curr)
+                self.mark(self.guard_pos, MapLabel.TRAVERSED_FOUR)
                 self.guard_pos = next_pos
                 result = Grid.NextResult.STEP_PREV_TRAVERSED
             case MapLabel.TRAVERSED_FOUR:
                 return self, Grid.NextResult.LOOP_FOUND
             case MapLabel.OBSTACLE:
                 # Don't change positions, turn instead
-                self.repr[self.guard_pos] = curr.turn()
+                self.mark(self.guard_pos, curr.turn())
                 result = Grid.NextResult.TURN
             case _:
-                raise ValueError(f"Unexpected value {self.repr[next_pos]} at {Grid.pos_to_str(next_pos)}")
+                raise ValueError(f"Unexpected value {chr(self.cells.cells[next_pos])} at {self.pos_to_str(next_pos)}")
 
         return self, result
     
     
     def in_bounds(self) -> bool:
-        return self.pos_in_bounds(self.guard_pos)
+        return self.guard_pos != OFF_GRID
+
 
+    def pos_in_bounds(self, row: int, col: int) -> bool:
+        return self.cells.in_bounds(row, col)
 
-    def pos_in_bounds(self, pos: Complex) -> bool:
-        return pos.real >= 0 and \
-            pos.imag >= 0 and \
-            pos.real < self.row_count and \
-            pos.imag < self.col_count
+
+# any byte that isn't a MapLabel, except the padding
+INVALID_PATTERN = re.compile(b'[^' + re.escape(''.join(MapLabel).encode('ascii') + bytes([PADDING])) + b']')
+GUARD_PATTERN = re.compile(b'[' + re.escape(''.join(l for l in MapLabel if l.is_guard()).encode('ascii')) + b']')
 
 
 def to_grid(input: str) -> Grid:
-    g: GridRepr = {row + col * 1j: MapLabel(c)
-                   for row, line in enumerate(input.splitlines())
-                   for col, c in enumerate(line)}
-    
-    lines = input.splitlines()
-    guard_pos = -1-1j
-    row_count = len(lines)
-    col_count = len(lines[0])
-
-    for row, line in enumerate(lines):
-        for col, c in enumerate(line):
-            # todo check all lines have the same length
-            if not c in MapLabel:
-                raise ValueError(f"Invalid value {c} at row {row}, col {col}")
-            
-            label = MapLabel(c)
-            pos = row + 1j * col
-            if label.is_guard() and guard_pos != -1-1j:
-                raise ValueError(f"Two guards found, at row {guard_pos.real}, col {guard_pos.imag}, and at row {pos.real}, col {pos.imag}")
-            if label.is_guard():
-                guard_pos = pos
-
-            g[pos] = label
-    
-    return Grid(g, guard_pos, row_count, col_count)
+    return to_grid_bytes(input.encode('ascii'))
+
+
+def to_grid_bytes(buf) -> Grid:
+    cells = PaddedGrid.from_bytes(buf)
+
+    if (invalid := INVALID_PATTERN.search(cells.cells)) is not None:
+        row, col = cells.position(invalid.start())
+        raise ValueError(f"Invalid value {chr(invalid[0][0])} at row {row}, col {col}")
+
+    guards = [m.start() for m in GUARD_PATTERN.finditer(cells.cells)]
+    if len(guards) > 1:
+        raise ValueError(f"Two guards found, at row {cells.position(guards[0])[0]}, col {cells.position(guards[0])[1]}, "
+                         f"and at row {cells.position(guards[1])[0]}, col {cells.position(guards[1])[1]}")
+
+    return Grid(cells, guards[0] if guards else OFF_GRID)
 
 
 def run_grid(g: Grid, count_traversals: bool = False) -> int:
@@ -228,26 +261,309 @@ def run_grid(g: Grid, count_traversals: bool = False) -> int:
 
 
 def place_obstacles(orig_grid: Grid, final_grid: Grid) -> list[Complex]:
-    traversed_positions = [pos for pos, label in final_grid.repr.items() if label == MapLabel.TRAVERSED and pos != orig_grid.guard_pos]
+    traversed = ord(MapLabel.TRAVERSED)
+    traversed_positions = [pos for pos, label in enumerate(final_grid.cells.cells) if label == traversed and pos != orig_grid.guard_pos]
 
     obstacles: list[Complex] = []
     for pos in traversed_positions:
         g = orig_grid.copy()
-        g.repr[pos] = MapLabel.OBSTACLE
+        g.mark(pos, MapLabel.OBSTACLE)
         if run_grid(g, True) == -1:
-            # print(f"Found loop with obstacle at {Grid.pos_to_str(pos)}")
-            obstacles.append(pos)
+            # print(f"Found loop with obstacle at {g.pos_to_str(pos)}")
+            row, col = g.cells.position(pos)
+            obstacles.append(row + 1j * col)
         
     return obstacles
 
 
-g = to_grid(input)
-steps = run_grid(final_grid := g.copy())
-print(f"Traversed {steps} steps.")
-# print(f"Final Grid:\n{g}")
+"""
+jump engine
+
+simulating one step at a time spends almost all its time walking down straight corridors.
+The only decisions the guard makes are at obstacles, so precompute for every cell and
+direction where the guard would stop (the cell before the next obstacle), and teleport
+from turn to turn.
+
+- cells are indexed row-major in flat arrays, so a step is adding a constant per direction
+- a trial obstacle isn't in the jump tables, so each jump checks whether it's on the way
+- the guard loops exactly when it turns at the same cell in the same direction twice,
+  so the visited (position, direction) states replace the traversal counters
+"""
+
+# directions in the order the guard turns through them
+GUARD_DIRECTIONS = [MapLabel.UP_GUARD, MapLabel.RIGHT_GUARD, MapLabel.DOWN_GUARD, MapLabel.LEFT_GUARD]
+UP, RIGHT, DOWN, LEFT = range(4)
+# the jump table entry of a cell the guard walks off the grid from
+EXIT = -1
+# translates MapLabel characters to 1 for obstacles and 0 otherwise
+OBSTACLE_TABLE = bytes(1 if chr(b) == MapLabel.OBSTACLE else 0 for b in range(256))
+
+
+@dataclass
+class JumpGrid():
+    row_count: int
+    col_count: int
+    # 1 for obstacles, row-major
+    obstacles: bytearray
+    guard_pos: int
+    guard_dir: int
+    # jumps[direction][cell] is where the guard stops walking in direction from cell, or EXIT
+    jumps: tuple[array, array, array, array]
+
+
+    def from_grid(g: Grid) -> JumpGrid:
+        rows, cols = g.row_count, g.col_count
+        # 1 where the grid has an obstacle, 0 everywhere else, without the padding
+        obstacles = bytearray().join(g.cells.row(row) for row in range(rows)).translate(OBSTACLE_TABLE)
+        guard_row, guard_col = g.cells.position(g.guard_pos)
+        guard_dir = GUARD_DIRECTIONS.index(g.label(g.guard_pos))
+        return JumpGrid(rows, cols, obstacles, guard_row * cols + guard_col, guard_dir, build_jumps(obstacles, rows, cols))
+
+
+    def steps(self) -> tuple[int, int, int, int]:
+        """Flat index offset of one step in each direction"""
+        return (-self.col_count, 1, self.col_count, -1)
+
+
+    def jump(self, pos: int, dir: int, extra_obstacle: int = EXIT) -> int:
+        """Returns where the guard stops walking from pos in dir, or EXIT.
+        extra_obstacle is an obstacle that isn't in the jump tables."""
+        stop = self.jumps[dir][pos]
+        if extra_obstacle == EXIT:
+            return stop
+
+        cols = self.col_count
+        o_row, o_col = divmod(extra_obstacle, cols)
+        p_row, p_col = divmod(pos, cols)
+        match dir:
+            case 0:
+                blocked = o_col == p_col and o_row < p_row and (stop == EXIT or o_row >= stop // cols)
+            case 1:
+                blocked = o_row == p_row and o_col > p_col and (stop == EXIT or o_col <= stop % cols)
+            case 2:
+                blocked = o_col == p_col and o_row > p_row and (stop == EXIT or o_row <= stop // cols)
+            case _:
+                blocked = o_row == p_row and o_col < p_col and (stop == EXIT or o_col >= stop % cols)
+        return extra_obstacle - self.steps()[dir] if blocked else stop
+
+
+    def loops(self, extra_obstacle: int = EXIT, pos: int | None = None, dir: int | None = None) -> bool:
+        """Returns whether the guard, starting from pos facing dir (by default from the
+        guard's starting state), walks in a loop rather than leaving the grid."""
+        pos = self.guard_pos if pos is None else pos
+        dir = self.guard_dir if dir is None else dir
+        turns: set[int] = set()
+        while (stop := self.jump(pos, dir, extra_obstacle)) != EXIT:
+            state = stop * 4 + dir
+            if state in turns:
+                return True
+            turns.add(state)
+            pos, dir = stop, (dir + 1) % 4
+        return False
+
+
+    def turn(self, turns: set[int], stop: int, dir: int) -> tuple[int, int]:
+        """Records that the guard turned at stop while facing dir, and returns its new state.
+        Raises ValueError if it already turned there facing the same way, since then it loops."""
+        state = stop * 4 + dir
+        if state in turns:
+            raise ValueError(f"The guard walks in a loop through {divmod(stop, self.col_count)}")
+        turns.add(state)
+        return stop, (dir + 1) % 4
+
+
+    def edge(self, pos: int, dir: int) -> int:
+        """Returns the last cell in the grid walking from pos in dir, ignoring obstacles."""
+        row, col = divmod(pos, self.col_count)
+        distance = [row, self.col_count - 1 - col, self.row_count - 1 - row, col][dir]
+        return pos + self.steps()[dir] * distance
+
+
+    def visited(self) -> bytearray:
+        """Returns 1 for each cell the guard walks through before leaving the grid.
+        Raises ValueError if the guard walks in a loop."""
+        visited = bytearray(self.row_count * self.col_count)
+        pos, dir = self.guard_pos, self.guard_dir
+        turns: set[int] = set()
+        while True:
+            stop = self.jump(pos, dir)
+            end = stop if stop != EXIT else self.edge(pos, dir)
+            step = self.steps()[dir]
+            # sliced low to high, since a negative stop past index 0 would wrap around
+            visited[min(pos, end):max(pos, end) + 1:abs(step)] = b'\x01' * (abs(end - pos) // abs(step) + 1)
+            if stop == EXIT:
+                return visited
+            pos, dir = self.turn(turns, stop, dir)
+
+
+    def first_contacts(self) -> list[tuple[int, int, int]]:
+        """Returns (cell, pos, dir) for each cell the guard walks into, in the order it first
+        does so, where the guard is at pos facing dir the moment before it first enters cell.
+        The guard's starting cell isn't included. Raises ValueError if the guard walks in a loop."""
+        seen = bytearray(self.row_count * self.col_count)
+        seen[self.guard_pos] = 1
+        contacts = []
+        pos, dir = self.guard_pos, self.guard_dir
+        turns: set[int] = set()
+        while True:
+            stop = self.jump(pos, dir)
+            end = stop if stop != EXIT else self.edge(pos, dir)
+            step = self.steps()[dir]
+            for prev in range(pos, end, step):
+                if not seen[cell := prev + step]:
+                    seen[cell] = 1
+                    contacts.append((cell, prev, dir))
+            if stop == EXIT:
+                return contacts
+            pos, dir = self.turn(turns, stop, dir)
+
+
+def build_jumps(obstacles: bytearray, rows: int, cols: int) -> tuple[array, array, array, array]:
+    """Sweeps each row and column once per direction, tracking the cell before the most
+    recent obstacle seen, which is where a guard walking towards it stops."""
+    jumps = tuple(array('q', [EXIT]) * (rows * cols) for _ in range(4))
+    up, right, down, left = jumps
+    for col in range(cols):
+        stop = EXIT
+        for i in range(col, rows * cols, cols):
+            if obstacles[i]:
+                stop = i + cols
+            else:
+                up[i] = stop
+        stop = EXIT
+        for i in range((rows - 1) * cols + col, -1, -cols):
+            if obstacles[i]:
+                stop = i - cols
+            else:
+                down[i] = stop
+    for row in range(rows):
+        stop = EXIT
+        for i in range(row * cols, (row + 1) * cols):
+            if obstacles[i]:
+                stop = i + 1
+            else:
+                left[i] = stop
+        stop = EXIT
+        for i in range((row + 1) * cols - 1, row * cols - 1, -1):
+            if obstacles[i]:
+                stop = i - 1
+            else:
+                right[i] = stop
+    return jumps
+
+
+def place_obstacles_fast(g: Grid, resume: bool = True) -> list[Complex]:
+    """Like place_obstacles, with the jump engine. Only cells on the guard's path can
+    change it, so those are the candidates.
+
+    The guard's path is the same as without the obstacle up until it first walks into it,
+    so with resume, each trial starts from the guard's state just before that instead of
+    from the guard's starting position."""
+    jg = JumpGrid.from_grid(g)
+
+    obstacles: list[Complex] = []
+    for cell, pos, dir in jg.first_contacts():
+        if jg.loops(cell, pos, dir) if resume else jg.loops(cell):
+            row, col = divmod(cell, jg.col_count)
+            obstacles.append(row + 1j * col)
+    return obstacles
+
+
+# each worker process's copy of the grid, set up once by _init_worker
+_worker_grid: JumpGrid | None = None
+_worker_contacts: list[tuple[int, int, int]] = []
+
+
+def _init_worker(shm_name: str, row_count: int, col_count: int, guard_pos: int, guard_dir: int):
+    global _worker_grid, _worker_contacts
+    shm = SharedMemory(name=shm_name)
+    try:
+        obstacles = bytearray(shm.buf[:row_count * col_count])
+    finally:
+        shm.close()
+    _worker_grid = JumpGrid(row_count, col_count, obstacles, guard_pos, guard_dir,
+                            build_jumps(obstacles, row_count, col_count))
+    # the baseline walk is deterministic, so every worker agrees on the order of the contacts
+    _worker_contacts = _worker_grid.first_contacts()
+
+
+def _find_loops(start_i: int, end_i: int) -> list[int]:
+    """Returns the cells of _worker_contacts[start_i:end_i] that make the guard loop."""
+    return [cell for cell, pos, dir in _worker_contacts[start_i:end_i]
+            if _worker_grid.loops(cell, pos, dir)]
+
+
+def place_obstacles_parallel(g: Grid, workers: int | None = None, shards_per_worker: int = 4) -> list[Complex]:
+    """Like place_obstacles_fast, with the trials split across worker processes.
+
+    The obstacles are copied into shared memory once, and each worker builds its own jump
+    tables and baseline walk from them when it starts. Tasks are then just ranges of the
+    baseline walk's contacts, and results are merged in that order so they don't depend
+    on which worker finishes first."""
+    workers = workers or os.cpu_count() or 1
+    jg = JumpGrid.from_grid(g)
+    contact_count = len(jg.first_contacts())
+    shard_size = max(-(-contact_count // (workers * shards_per_worker)), 1)
+    starts = range(0, contact_count, shard_size)
+
+    shm = SharedMemory(create=True, size=max(len(jg.obstacles), 1))
+    try:
+        shm.buf[:len(jg.obstacles)] = jg.obstacles
+        with ProcessPoolExecutor(workers, initializer=_init_worker,
+                                 initargs=(shm.name, jg.row_count, jg.col_count, jg.guard_pos, jg.guard_dir)) as executor:
+            shards = executor.map(_find_loops, starts, [start_i + shard_size for start_i in starts])
+            looping = [cell for shard in shards for cell in shard]
+    finally:
+        shm.close()
+        shm.unlink()
+
+    return [row + 1j * col for row, col in (divmod(cell, jg.col_count) for cell in looping)]
+
+
+def parse(input: str) -> Grid:
+    return to_grid(input)
+
+
+def parse_bytes(buf) -> Grid:
+    """Like parse, for a buffer such as an mmap from input.open_input_mmap"""
+    return to_grid_bytes(buf)
+
+
+def part1(g: Grid) -> int:
+    return sum(JumpGrid.from_grid(g).visited())
+
+
+def part2(g: Grid) -> int:
+    return len(place_obstacles_fast(g))
+
+
+# solver variants measured by bench.py
+BENCHMARKS = {
+    'run_grid': lambda g: run_grid(g.copy()),
+    'place_obstacles': lambda g: place_obstacles(g, (final_grid := g.copy(), run_grid(final_grid))[0]),
+    'visited_jumps': lambda g: JumpGrid.from_grid(g).visited(),
+    'place_obstacles_fast': place_obstacles_fast,
+    'place_obstacles_fast_from_start': lambda g: place_obstacles_fast(g, resume=False),
+    'place_obstacles_parallel': place_obstacles_parallel,
+}
+# place_obstacles takes over a minute on the real input
+SLOW_BENCHMARKS = {'place_obstacles'}
+
+
+def main():
+    g = parse(read_input(YEAR, DAY))
+    steps = run_grid(final_grid := g.copy())
+    print(f"Traversed {steps} steps.")
+    # print(f"Final Grid:\n{g}")
+
+    obstacles = place_obstacles_fast(g)
+    print(f"Found {len(obstacles)} obstacle placements that would result in a loop")
+    # print(f"Placements: {[Grid.pos_to_str(o) for o in obstacles]}")
 
-obstacles = place_obstacles(g, final_grid)
-print(f"Found {len(obstacles)} obstacle placements that would result in a loop")
-# print(f"Placements: {[Grid.pos_to_str(o) for o in obstacles]}")
+if __name__ == '__main__':
+    main()
 
-# Outputs 1577, that's too high. What's the issue?
\ No newline at end of file
+# place_obstacles outputs 1577, that's too high. What's the issue?
+# - Grid.next bumps the traversal counter of the cell being left based on the label of the
+#   cell being entered, so the counters don't count entries and loops are found too eagerly.
+#   place_obstacles_fast tracks (position, direction) states instead.
\ No newline at end of file
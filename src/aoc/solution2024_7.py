@@ -1,14 +1,17 @@
-from input import open_input
-import re
+from input import open_input, read_input
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from dataclasses import dataclass
 from enum import Enum
-import functools
+import heapq
+import os
+import time
 
-input = ""
-with open_input(filename="input.txt") as f:
-    input = f.read().strip()
+YEAR = 2024
+DAY = 7
 
-@dataclass
+# slots, so millions of equations don't each carry a __dict__
+@dataclass(slots=True)
 class Equation():
     value: int
     operands: list[int]
@@ -19,24 +22,25 @@ class Op(Enum):
     MUL = 2
     CON = 3
 
-def parse_input(input: str) -> list[Equation]:
-    eqs: list[Equation] = []
-    for i, l in enumerate(input.splitlines()):
-        match = re.match(r'(?P<value>\d+):( (?P<operand>\d+))+', l)
-        if match is None:
-            raise ValueError(f"Line {i + 1} was in an unexpected format: {l}")
-        
-        value, op_str = l.split(':')
+def iter_equations(lines: Iterable[str]) -> Iterator[Equation]:
+    """Parses equations one line at a time, e.g. from an open file. Blank lines are skipped."""
+    for i, l in enumerate(lines):
+        l = l.rstrip('\r\n')
+        if not l:
+            continue
+
+        value, sep, op_str = l.partition(':')
         operands = op_str.split(' ')
+        # operands has a leading empty string from the space after the colon
+        if not sep or not value.isdigit() or len(operands) < 2 or operands[0] \
+            or not all(op.isdigit() for op in operands[1:]):
+            raise ValueError(f"Line {i + 1} was in an unexpected format: {l}")
+
+        yield Equation(int(value), [int(op) for op in operands[1:]])
 
-        assert len(operands) > 1, "There should be at least two operands"
-        
-        eqs.append(Equation(
-            int(value), 
-            # operands has a trailing space, which we need to ignore
-            [int(op) for op in operands[1:]]))
 
-    return eqs
+def parse_input(input: str) -> list[Equation]:
+    return list(iter_equations(input.splitlines()))
 
 
 def satisfies(eq: Equation, available_ops: list[Op] = [Op.ADD, Op.MUL]) -> bool:
@@ -52,7 +56,7 @@ def satisfies(eq: Equation, available_ops: list[Op] = [Op.ADD, Op.MUL]) -> bool:
                 case Op.MUL:
                     acc *= operand
                 case Op.CON:
-                    acc = int(f"{acc}{operand}")
+                    acc = acc * concat_shift(operand) + operand
         return acc     
 
     def satisfies_recur(ops: list[Op]) -> bool:
@@ -69,6 +73,48 @@ def satisfies(eq: Equation, available_ops: list[Op] = [Op.ADD, Op.MUL]) -> bool:
     return satisfies_recur([])
 
 
+def concat_shift(operand: int) -> int:
+    """The power of ten that shifts a number left past operand's digits, so that
+    a || b == a * concat_shift(b) + b"""
+    shift = 10
+    while shift <= operand:
+        shift *= 10
+    return shift
+
+
+def satisfies_backwards(eq: Equation, available_ops: list[Op] = [Op.ADD, Op.MUL]) -> bool:
+    """Like satisfies, but searches from the value back to the first operand.
+
+    Operators are evaluated left to right, so the last operator is applied last, and each
+    one can be undone from the right. Most can't be, which prunes the search early:
+    - ADD only if the operand isn't more than what's left (operands are never negative)
+    - MUL only if the operand divides what's left, or if it's 0 and so is what's left,
+      since then anything before it works
+    - CON only if what's left ends in the operand's digits
+    """
+    operands = eq.operands
+    add, mul, con = Op.ADD in available_ops, Op.MUL in available_ops, Op.CON in available_ops
+    shifts = [concat_shift(operand) for operand in operands] if con else []
+
+    def satisfies_recur(target: int, i: int) -> bool:
+        operand = operands[i]
+        if i == 0:
+            return target == operand
+        if add and target >= operand and satisfies_recur(target - operand, i - 1):
+            return True
+        if mul:
+            if operand == 0:
+                if target == 0:
+                    return True
+            elif target % operand == 0 and satisfies_recur(target // operand, i - 1):
+                return True
+        if con and target % shifts[i] == operand and satisfies_recur(target // shifts[i], i - 1):
+            return True
+        return False
+
+    return satisfies_recur(eq.value, len(operands) - 1)
+
+
 def sum_eq_values(eqs: list[Equation]) -> int:
     acc = 0
     for eq in eqs:
@@ -76,9 +122,122 @@ def sum_eq_values(eqs: list[Equation]) -> int:
     return acc
 
 
-eqs = parse_input(input)
-satisfying_eqs = [eq for eq in eqs if satisfies(eq, [Op.ADD, Op.MUL, Op.CON])]
+def sum_satisfying(eqs: list[Equation], available_ops: list[Op]) -> int:
+    return sum_eq_values([eq for eq in eqs if satisfies_backwards(eq, available_ops)])
+
+
+def equation_cost(eq: Equation) -> int:
+    """Estimated cost of solving an equation. The backwards search undoes one operator per
+    operand on almost every branch it takes, so it's about the operand count."""
+    return len(eq.operands)
+
+
+def balanced_chunks(eqs: list[Equation], chunk_count: int) -> list[list[Equation]]:
+    """Splits equations into at most chunk_count chunks of about equal total cost,
+    by giving the most expensive remaining equation to the cheapest chunk so far."""
+    chunk_count = max(min(chunk_count, len(eqs)), 1)
+    chunks: list[list[Equation]] = [[] for _ in range(chunk_count)]
+    # (total cost, chunk index)
+    loads = [(0, i) for i in range(chunk_count)]
+    for eq in sorted(eqs, key=equation_cost, reverse=True):
+        cost, i = heapq.heappop(loads)
+        chunks[i].append(eq)
+        heapq.heappush(loads, (cost + equation_cost(eq), i))
+    return chunks
+
+
+@dataclass
+class ChunkResult():
+    chunk: int
+    equations: int
+    cost: int
+    # sum of the values of the satisfiable equations in the chunk
+    total: int
+    # wall time in seconds spent solving the chunk in its worker
+    seconds: float
+
+
+def _solve_chunk(chunk: int, eqs: list[Equation], available_ops: list[Op]) -> ChunkResult:
+    start = time.perf_counter()
+    total = sum_satisfying(eqs, available_ops)
+    return ChunkResult(chunk, len(eqs), sum(equation_cost(eq) for eq in eqs), total, time.perf_counter() - start)
+
+
+def solve_chunks(eqs: list[Equation],
+                 available_ops: list[Op] = [Op.ADD, Op.MUL],
+                 workers: int | None = None,
+                 chunks_per_worker: int = 4) -> Iterator[ChunkResult]:
+    """Solves cost-balanced chunks of the equations across worker processes.
+    Yields: each chunk's result as soon as its worker finishes it"""
+    workers = workers or os.cpu_count() or 1
+    chunks = balanced_chunks(eqs, workers * chunks_per_worker)
+    with ProcessPoolExecutor(workers) as executor:
+        futures = [executor.submit(_solve_chunk, i, chunk, available_ops) for i, chunk in enumerate(chunks)]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def sum_satisfying_parallel(eqs: list[Equation],
+                            available_ops: list[Op] = [Op.ADD, Op.MUL],
+                            workers: int | None = None,
+                            verbose = False) -> int:
+    """Like sum_satisfying, with the equations split across worker processes.
+    If verbose, prints how long each chunk took, in the order they finished."""
+    acc = 0
+    for result in solve_chunks(eqs, available_ops, workers):
+        acc += result.total
+        if verbose:
+            print(f"chunk {result.chunk:>3}: {result.equations:>6} equations, cost {result.cost:>8}, "
+                  f"{result.seconds * 1000:>9.2f} ms")
+    return acc
+
+
+def solve_streaming(filename = 'input.txt') -> tuple[int, int]:
+    """Solves both parts for an input file of any size, solving each equation as its line is
+    read, so only one equation is ever held in memory.
+    Returns: (part 1, part 2)"""
+    pt1 = pt2 = 0
+    with open_input(filename=filename, year=YEAR, day=DAY) as f:
+        for eq in iter_equations(f):
+            # anything satisfiable without concatenation is satisfiable with it
+            if satisfies_backwards(eq, [Op.ADD, Op.MUL]):
+                pt1 += eq.value
+                pt2 += eq.value
+            elif satisfies_backwards(eq, [Op.ADD, Op.MUL, Op.CON]):
+                pt2 += eq.value
+    return pt1, pt2
+
+
+def parse(input: str) -> list[Equation]:
+    return parse_input(input)
+
+
+def part1(eqs: list[Equation]) -> int:
+    return sum_satisfying(eqs, [Op.ADD, Op.MUL])
+
+
+def part2(eqs: list[Equation]) -> int:
+    return sum_satisfying(eqs, [Op.ADD, Op.MUL, Op.CON])
+
+
+# solver variants measured by bench.py
+BENCHMARKS = {
+    'satisfies': lambda eqs: sum_eq_values([eq for eq in eqs if satisfies(eq, [Op.ADD, Op.MUL])]),
+    'satisfies_con': lambda eqs: sum_eq_values([eq for eq in eqs if satisfies(eq, [Op.ADD, Op.MUL, Op.CON])]),
+    'satisfies_backwards': part1,
+    'satisfies_backwards_con': part2,
+    'satisfies_parallel_con': lambda eqs: sum_satisfying_parallel(eqs, [Op.ADD, Op.MUL, Op.CON]),
+}
+SLOW_BENCHMARKS = {'satisfies_con'}
+
+
+def main():
+    eqs = parse(read_input(YEAR, DAY))
+    # print(f"eqs: {eqs}")
+    print(f"Sum of satisfying pt 1: {part1(eqs)}")
+    print(f"Sum of satisfying: {part2(eqs)}")
+    print("per-chunk timings of the parallel batch:")
+    sum_satisfying_parallel(eqs, [Op.ADD, Op.MUL, Op.CON], verbose=True)
 
-# print(f"eqs: {parse_input(input)}")
-# print(f"Satisfying equations: {satisfying_eqs}")
-print(f"Sum of satisfying: {sum_eq_values(satisfying_eqs)}")
\ No newline at end of file
+if __name__ == '__main__':
+    main()
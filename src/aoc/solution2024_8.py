@@ -1,9 +1,25 @@
 
+from array import array
 from collections import defaultdict
+from collections.abc import Iterable
 from dataclasses import dataclass, field
-from input import open_input
-from itertools import combinations, permutations
+from grid import PADDING, PaddedGrid
+from input import read_input
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations, permutations, repeat
+from math import gcd
 from typing import Mapping, Set
+import os
+import re
+
+try:
+    import numpy as np
+except ImportError:
+    # the numpy engine is optional
+    np = None
+
+YEAR = 2024
+DAY = 8
 
 # real part is row, imaginary is col
 type Pos = complex
@@ -14,6 +30,8 @@ type Antenna = str
 ROW_DIM = 0
 COL_DIM = 1
 
+ANTENNA_PATTERN = re.compile(b'[^.' + re.escape(bytes([PADDING])) + b']')
+
 @dataclass
 class Grid():
     # rows, columns
@@ -43,23 +61,18 @@ class Grid():
 
 
 def parse_input(input: str) -> Grid:
-    lines = input.splitlines()
+    return parse_input_bytes(input.encode('ascii'))
 
-    assert len(lines) > 0, f"There must be at least one line"
-    assert len(lines[0]) > 0, f"Lines must have at least one position"
-    # todo assert all lines same width
 
-    dim = len(lines), len(lines[0])
-    g = Grid(dim)
+def parse_input_bytes(buf) -> Grid:
+    cells = PaddedGrid.from_bytes(buf)
+    g = Grid((cells.row_count, cells.col_count))
 
-    for row, line in enumerate(lines):
-        for col, ch in enumerate(line):
-            match ch:
-                case '.':
-                    continue
-                case _:
-                    g.freqs.add(ch)
-                    g.antennae[g.to_pos(row, col)] = ch
+    # anything but empty space or padding is an antenna
+    for match in ANTENNA_PATTERN.finditer(cells.cells):
+        ch = chr(match[0][0])
+        g.freqs.add(ch)
+        g.antennae[g.to_pos(*cells.position(match.start()))] = ch
 
     # todo freeze g somehow
     return g
@@ -77,6 +90,13 @@ def distance(p1: Pos, p2: Pos) -> Pos:
     return p2 - p1
 
 
+def reduce_step(d: Pos) -> Pos:
+    """The smallest integer step in the direction of d"""
+    d_row, d_col = int(d.real), int(d.imag)
+    divisor = gcd(d_row, d_col)
+    return complex(d_row // divisor, d_col // divisor)
+
+
 def calculate_antinodes(g: Grid) -> Grid:
     """Find antinodes for the grid, and returns a copy of grid where the
     antennae field is set with antinode positions.
@@ -108,23 +128,272 @@ def calculate_antinodes_pt2(g: Grid) -> Grid:
     If antinodes of different frequencies overlap, the lexographically greatest
     frequency will be set.
     
-    An antinode is a position at +/- l*n from a pair of antennae, where l is the distance
-    vector between the antennae, and n is a positive integer. 
+    An antinode is any position in line with a pair of antennae, i.e. at +/- l*n from them,
+    where l is the distance vector between the antennae reduced to its smallest integer step,
+    and n is a positive integer. 
     """
     f_to_p = freq_to_pos(g)
 
     an_grid = Grid(g.dim, freqs=g.freqs)
     for freq in sorted(g.freqs):
         for p1, p2 in permutations(f_to_p[freq], 2):
-            basis = distance(p1, p2)
+            basis = reduce_step(distance(p1, p2))
             n = 0
-            while an_grid.in_bounds(an := p2 + basis * n):
+            while an_grid.in_bounds(an := p1 + basis * n):
                 an_grid.antennae[an] = freq   
                 n += 1                 
 
     return an_grid
 
 
+"""
+bitmap engine
+
+antinodes are only ever counted, so instead of a dict of positions they can be marked in a
+bitmap of one byte per cell, row-major, and counted in one pass with bytearray.count.
+For part 2, the cells in line with a pair are an arithmetic sequence of flat indices, and the
+range of multiples of the step that stays on the grid can be solved for directly, so a whole
+line is marked with one slice assignment instead of one bounds check per cell.
+"""
+
+def multiple_range(start: int, step: int, size: int) -> tuple[int, int]:
+    """The range [lo, hi] of n for which 0 <= start + n * step < size. step must not be 0."""
+    if step > 0:
+        return -(start // step), (size - 1 - start) // step
+    return -((size - 1 - start) // -step), start // -step
+
+
+def antinode_pair(dim: tuple[int, int], cell1: tuple[int, int], cell2: tuple[int, int]) -> list[int]:
+    """Flat indices of the antinodes of a pair of antennae, as in calculate_antinodes"""
+    rows, cols = dim
+    (r1, c1), (r2, c2) = cell1, cell2
+    return [row * cols + col
+            for row, col in ((2 * r1 - r2, 2 * c1 - c2), (2 * r2 - r1, 2 * c2 - c1))
+            if 0 <= row < rows and 0 <= col < cols]
+
+
+def resonant_line(dim: tuple[int, int], cell1: tuple[int, int], cell2: tuple[int, int]) -> range:
+    """Flat indices of the antinodes of a pair of antennae, as in calculate_antinodes_pt2,
+    in increasing order"""
+    rows, cols = dim
+    (r1, c1), (r2, c2) = cell1, cell2
+    d_row, d_col = r2 - r1, c2 - c1
+    divisor = gcd(d_row, d_col)
+    d_row, d_col = d_row // divisor, d_col // divisor
+    # walk the line so flat indices increase, so it can be used as a slice
+    if d_row < 0 or (d_row == 0 and d_col < 0):
+        d_row, d_col = -d_row, -d_col
+
+    lo, hi = -rows - cols, rows + cols
+    if d_row != 0:
+        row_lo, row_hi = multiple_range(r1, d_row, rows)
+        lo, hi = max(lo, row_lo), min(hi, row_hi)
+    if d_col != 0:
+        col_lo, col_hi = multiple_range(c1, d_col, cols)
+        lo, hi = max(lo, col_lo), min(hi, col_hi)
+
+    start, step = r1 * cols + c1, d_row * cols + d_col
+    return range(start + lo * step, start + hi * step + 1, step)
+
+
+def mark_antinodes(bitmap: bytearray, dim: tuple[int, int], cells: list[tuple[int, int]]):
+    """Marks the antinodes of one frequency's antennae at (row, col) cells, as in calculate_antinodes"""
+    for cell1, cell2 in combinations(cells, 2):
+        for i in antinode_pair(dim, cell1, cell2):
+            bitmap[i] = 1
+
+
+def mark_antinodes_pt2(bitmap: bytearray, dim: tuple[int, int], cells: list[tuple[int, int]]):
+    """Marks the antinodes of one frequency's antennae at (row, col) cells, as in calculate_antinodes_pt2"""
+    for cell1, cell2 in combinations(cells, 2):
+        line = resonant_line(dim, cell1, cell2)
+        bitmap[line.start:line.stop:line.step] = b'\x01' * len(line)
+
+
+def freq_to_cells(g: Grid) -> list[list[tuple[int, int]]]:
+    """(row, col) cells of the antennae of each frequency"""
+    return [[(int(p.real), int(p.imag)) for p in positions] for positions in freq_to_pos(g).values()]
+
+
+def antinode_bitmap(g: Grid) -> bytearray:
+    """Marks the antinodes of calculate_antinodes with 1 in a row-major bitmap of the grid"""
+    bitmap = bytearray(g.dim[ROW_DIM] * g.dim[COL_DIM])
+    for cells in freq_to_cells(g):
+        mark_antinodes(bitmap, g.dim, cells)
+    return bitmap
+
+
+def antinode_bitmap_pt2(g: Grid) -> bytearray:
+    """Marks the antinodes of calculate_antinodes_pt2 with 1 in a row-major bitmap of the grid"""
+    bitmap = bytearray(g.dim[ROW_DIM] * g.dim[COL_DIM])
+    for cells in freq_to_cells(g):
+        mark_antinodes_pt2(bitmap, g.dim, cells)
+    return bitmap
+
+
+def antinode_bitmap_pt2_numpy(g: Grid) -> np.ndarray:
+    """Like antinode_bitmap_pt2, with all pairs of a frequency handled at once as arrays.
+    Every pair's line is expanded into its flat indices, which are marked in one scatter."""
+    rows, cols = g.dim
+    bitmap = np.zeros(rows * cols, dtype=bool)
+    for positions in freq_to_pos(g).values():
+        if len(positions) < 2:
+            continue
+        pos_rows = np.array([int(p.real) for p in positions], dtype=np.int64)
+        pos_cols = np.array([int(p.imag) for p in positions], dtype=np.int64)
+        first, second = np.triu_indices(len(positions), 1)
+        r1, c1 = pos_rows[first], pos_cols[first]
+
+        d_row, d_col = pos_rows[second] - r1, pos_cols[second] - c1
+        divisor = np.gcd(d_row, d_col)
+        d_row, d_col = d_row // divisor, d_col // divisor
+        # walk each line so flat indices increase
+        flip = (d_row < 0) | ((d_row == 0) & (d_col < 0))
+        d_row, d_col = np.where(flip, -d_row, d_row), np.where(flip, -d_col, d_col)
+
+        # a line along one axis is only bounded by the other, so past both is as far as it goes
+        lo, hi = multiple_range_numpy(r1, d_row, rows, rows + cols)
+        col_lo, col_hi = multiple_range_numpy(c1, d_col, cols, rows + cols)
+        lo, hi = np.maximum(lo, col_lo), np.minimum(hi, col_hi)
+
+        # the n of every antinode of every pair, grouped by pair
+        counts = hi - lo + 1
+        pair = np.repeat(np.arange(len(counts)), counts)
+        n = lo[pair] + np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        bitmap[(r1 * cols + c1)[pair] + n * (d_row * cols + d_col)[pair]] = True
+    return bitmap
+
+
+def multiple_range_numpy(start: np.ndarray, step: np.ndarray, size: int, unbounded_size: int) -> tuple[np.ndarray, np.ndarray]:
+    """multiple_range of arrays. Where step is 0 the range is [-unbounded_size, unbounded_size],
+    which must reach past the grid along any line."""
+    magnitude = np.maximum(np.abs(step), 1)
+    lo = np.where(step > 0, -(start // magnitude), -((size - 1 - start) // magnitude))
+    hi = np.where(step > 0, (size - 1 - start) // magnitude, start // magnitude)
+    unbounded = step == 0
+    return np.where(unbounded, -unbounded_size, lo), np.where(unbounded, unbounded_size, hi)
+
+
+def count_bitmap(bitmap: bytearray) -> int:
+    return bitmap.count(1)
+
+
+# translates a bitmap of 0 and 1 bytes to the digits of a binary number
+BINARY_DIGITS = bytes.maketrans(b'\x00\x01', b'01')
+
+
+def pack_bitmap(bitmap: bytearray) -> int:
+    """Packs a bitmap of one byte per cell into an int with cell i as bit i,
+    which is 8 times smaller to send between processes, ORs in one operation,
+    and counts with int.bit_count."""
+    return int(bitmap.translate(BINARY_DIGITS)[::-1] or b'0', 2)
+
+
+def _frequency_antinodes(dim: tuple[int, int], cells: list[tuple[int, int]], resonant: bool) -> int:
+    """Packed bitmap of one frequency's antinodes, computed in a worker process"""
+    bitmap = bytearray(dim[ROW_DIM] * dim[COL_DIM])
+    (mark_antinodes_pt2 if resonant else mark_antinodes)(bitmap, dim, cells)
+    return pack_bitmap(bitmap)
+
+
+def count_antinodes_parallel(g: Grid, resonant = False, workers: int | None = None) -> int:
+    """Counts the antinodes like antinode_bitmap, or antinode_bitmap_pt2 if resonant,
+    with each frequency's pairs marked in a separate task across worker processes.
+    Antinodes of different frequencies only meet in the merged bitmap, where they are ORed."""
+    workers = workers or os.cpu_count() or 1
+    # the frequencies with the most pairs go first, so they don't finish last
+    tasks = sorted(freq_to_cells(g), key=len, reverse=True)
+
+    merged = 0
+    with ProcessPoolExecutor(workers) as executor:
+        for packed in executor.map(_frequency_antinodes, repeat(g.dim), tasks, repeat(resonant)):
+            merged |= packed
+    return merged.bit_count()
+
+
+class AntinodeIndex():
+    """The antinodes of a grid, kept up to date as antennae are added and removed.
+
+    Each cell counts the pairs of antennae it's an antinode of, so adding or removing an
+    antenna only visits its pairs with the k other antennae of its frequency, and a cell
+    stops being an antinode exactly when its count drops back to 0. The number of antinodes
+    is kept as the counts change.
+    """
+
+    def __init__(self, g: Grid, resonant = False):
+        """Indexes the antinodes of calculate_antinodes, or of calculate_antinodes_pt2 if resonant.
+        The index keeps its own copy of the grid's antennae."""
+        self.grid = Grid(g.dim)
+        self.resonant = resonant
+        self.pair_counts = array('l', [0]) * (g.dim[ROW_DIM] * g.dim[COL_DIM])
+        self.cells_by_freq: dict[Antenna, list[tuple[int, int]]] = defaultdict(list)
+        self._count = 0
+        for pos, freq in g.antennae.items():
+            self.add_antenna(pos, freq)
+
+
+    def count(self) -> int:
+        return self._count
+
+
+    def is_antinode(self, pos: Pos) -> bool:
+        self._check_cell(pos)
+        return self.pair_counts[int(pos.real) * self.grid.dim[COL_DIM] + int(pos.imag)] > 0
+
+
+    def _pair_antinodes(self, cell1: tuple[int, int], cell2: tuple[int, int]) -> Iterable[int]:
+        if self.resonant:
+            return resonant_line(self.grid.dim, cell1, cell2)
+        return antinode_pair(self.grid.dim, cell1, cell2)
+
+
+    def _update_pairs(self, cell: tuple[int, int], others: list[tuple[int, int]], delta: int):
+        counts = self.pair_counts
+        for other in others:
+            for i in self._pair_antinodes(cell, other):
+                counts[i] += delta
+                if delta > 0 and counts[i] == 1:
+                    self._count += 1
+                elif delta < 0 and counts[i] == 0:
+                    self._count -= 1
+
+
+    def _check_cell(self, pos: Pos):
+        if not self.grid.in_bounds(pos) or pos != complex(int(pos.real), int(pos.imag)):
+            raise ValueError(f"{pos} is not a cell of the {self.grid.dim} grid")
+
+
+    def add_antenna(self, pos: Pos, freq: Antenna):
+        self._check_cell(pos)
+        if pos in self.grid.antennae:
+            raise ValueError(f"There is already an antenna at {pos}")
+
+        cell = (int(pos.real), int(pos.imag))
+        others = self.cells_by_freq[freq]
+        self._update_pairs(cell, others, 1)
+        others.append(cell)
+        self.grid.antennae[pos] = freq
+        self.grid.freqs.add(freq)
+
+
+    def remove_antenna(self, pos: Pos) -> Antenna:
+        """Removes the antenna at pos and returns its frequency"""
+        if not self.grid.in_bounds(pos):
+            raise ValueError(f"{pos} is not a cell of the {self.grid.dim} grid")
+        if pos not in self.grid.antennae:
+            raise ValueError(f"There is no antenna at {pos}")
+
+        freq = self.grid.antennae.pop(pos)
+        cell = (int(pos.real), int(pos.imag))
+        others = self.cells_by_freq[freq]
+        others.remove(cell)
+        self._update_pairs(cell, others, -1)
+        if not others:
+            del self.cells_by_freq[freq]
+            self.grid.freqs.discard(freq)
+        return freq
+
+
 def render_antinodes(grid: Grid, antinode_grid: Grid) -> str:
     """Returns a string representation of the grid, where antinodes are marked with '#'.
     
@@ -142,12 +411,37 @@ def count_antinodes(antinode_grid: Grid) -> int:
     return len(antinode_grid.antennae)
 
 
-def main():
-    input = ""
-    with open_input(filename="input.txt") as f:
-        input = f.read().strip()
+def parse(input: str) -> Grid:
+    return parse_input(input)
 
-    g = parse_input(input)
+
+def parse_bytes(buf) -> Grid:
+    """Like parse, for a buffer such as an mmap from input.open_input_mmap"""
+    return parse_input_bytes(buf)
+
+
+def part1(g: Grid) -> int:
+    return count_bitmap(antinode_bitmap(g))
+
+
+def part2(g: Grid) -> int:
+    return count_bitmap(antinode_bitmap_pt2(g))
+
+
+# solver variants measured by bench.py
+BENCHMARKS = {
+    'calculate_antinodes': lambda g: count_antinodes(calculate_antinodes(g)),
+    'calculate_antinodes_pt2': lambda g: count_antinodes(calculate_antinodes_pt2(g)),
+    'antinode_bitmap': part1,
+    'antinode_bitmap_pt2': part2,
+    'count_antinodes_parallel_pt2': lambda g: count_antinodes_parallel(g, resonant=True),
+}
+if np is not None:
+    BENCHMARKS['antinode_bitmap_pt2_numpy'] = lambda g: int(np.count_nonzero(antinode_bitmap_pt2_numpy(g)))
+
+
+def main():
+    g = parse(read_input(YEAR, DAY))
     an_grid = calculate_antinodes_pt2(g)
 
     # print(f"parsed grid:\t{g}")
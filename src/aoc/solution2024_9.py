@@ -1,7 +1,20 @@
+from __future__ import annotations
+
+from array import array
 from collections import namedtuple
-from input import open_input
+from dataclasses import dataclass, field
+from input import open_input_mmap, read_input, strip
 import itertools as it
 
+try:
+    import numpy as np
+except ImportError:
+    # the numpy engine is optional
+    np = None
+
+YEAR = 2024
+DAY = 9
+
 # step 1: parse input
 # - we're going to need to look at block indices and multiply with file number,
 #   which implies we'll probably need to allocate an array with the total size
@@ -57,7 +70,9 @@ def parse_input(input: str) -> Disk:
     return disk
 
 
-def render_disk(disk: Disk) -> str:
+def render_disk(disk: Disk | ExtentDisk) -> str:
+    if isinstance(disk, ExtentDisk):
+        disk = disk.to_blocks()
     return ''.join([str(disk[i]) if disk[i] != EMPTY else '.' for i in range(len(disk))])
 
 
@@ -84,8 +99,11 @@ def file_extent(disk: Disk, last_i: int) -> int:
     return last_i - start_i
     
 
-def compact(disk: Disk) -> Disk:
+def compact(disk: Disk | ExtentDisk) -> Disk | ExtentDisk:
     """Returns a compacted copy of disk"""
+    if isinstance(disk, ExtentDisk):
+        return compact_extents(disk)
+
     compacted = disk[:]
 
     free_i = leftmost_free_index(disk)
@@ -159,9 +177,8 @@ def interval_length(i: Interval) -> int:
     return i.end_i - i.start_i + 1
 
 
-def compact_pt2_try2(disk: Disk) -> Disk:
-    """Returns a compacted copy of disk without fragmenting files."""
-    # Build intervals
+def find_intervals(disk: Disk) -> tuple[list[Interval], list[Interval]]:
+    """Returns the intervals of files and of empty blocks on the disk, both in disk order."""
     files: list[Interval] = []
     empty_blocks: list[Interval] = []
 
@@ -185,6 +202,17 @@ def compact_pt2_try2(disk: Disk) -> Disk:
     # add final file
     add_interval(len(disk))
 
+    return files, empty_blocks
+
+
+def compact_pt2_try2(disk: Disk | ExtentDisk) -> Disk | ExtentDisk:
+    """Returns a compacted copy of disk without fragmenting files."""
+    if isinstance(disk, ExtentDisk):
+        return compact_pt2_extents(disk)
+
+    # Build intervals
+    files, empty_blocks = find_intervals(disk)
+
     # print(f"Files: {files}")
     # print(f"Empty Blocks: {empty_blocks}")
         
@@ -232,32 +260,370 @@ def compact_pt2_try2(disk: Disk) -> Disk:
     return [interval.file for interval in disk_intervals for _ in range(interval_length(interval))]
 
 
-def checksum(disk: Disk) -> int:
+class FreeSpanIndex():
+    """Index of free spans on a disk, for finding the leftmost span that can fit a file.
+
+    The spans are kept in disk order in the leaves of a segment tree, and each inner node
+    holds the largest span length below it. Finding the leftmost span with at least k blocks
+    descends from the root, preferring the left child whenever it's large enough, so both
+    lookups and updates take O(log n) time.
+    """
+    def __init__(self, spans: list[Interval]):
+        self.starts = [span.start_i for span in spans]
+        self.leaf_count = 1
+        while self.leaf_count < len(spans):
+            self.leaf_count *= 2
+        self.tree = [0] * (2 * self.leaf_count)
+        for span_i, span in enumerate(spans):
+            self.tree[self.leaf_count + span_i] = interval_length(span)
+        for node in range(self.leaf_count - 1, 0, -1):
+            self.tree[node] = max(self.tree[2 * node], self.tree[2 * node + 1])
+
+
+    def leftmost(self, size: int, before_i: int) -> int | None:
+        """Returns the index of the leftmost span with at least size blocks that starts
+        before the disk index before_i, or None if there isn't one."""
+        tree = self.tree
+        if tree[1] < size:
+            return None
+        node = 1
+        while node < self.leaf_count:
+            node = 2 * node if tree[2 * node] >= size else 2 * node + 1
+        span_i = node - self.leaf_count
+        return span_i if self.starts[span_i] < before_i else None
+
+
+    def allocate(self, span_i: int, size: int) -> int:
+        """Takes size blocks from the front of the span and returns the disk index they start at."""
+        start_i = self.starts[span_i]
+        self.starts[span_i] += size
+
+        tree = self.tree
+        node = self.leaf_count + span_i
+        tree[node] -= size
+        node //= 2
+        while node > 0:
+            tree[node] = max(tree[2 * node], tree[2 * node + 1])
+            node //= 2
+        return start_i
+
+
+def compact_pt2_segment_tree(disk: Disk | ExtentDisk) -> Disk | ExtentDisk:
+    """Returns a compacted copy of disk without fragmenting files.
+    Like compact_pt2_try2, but the free spans are searched with a FreeSpanIndex
+    so the whole compaction is O(n log n) in the number of files."""
+    if isinstance(disk, ExtentDisk):
+        return compact_pt2_extents(disk)
+
+    files, empty_blocks = find_intervals(disk)
+    free_spans = FreeSpanIndex(empty_blocks)
+
+    compacted: Disk = [EMPTY] * len(disk)
+    # files only ever move left, and each is moved at most once, so the space a file
+    # vacates never needs to be indexed: every file still to be moved is left of it.
+    for file in reversed(files):
+        size = interval_length(file)
+        start_i = file.start_i
+        if (span_i := free_spans.leftmost(size, file.start_i)) is not None:
+            start_i = free_spans.allocate(span_i, size)
+        compacted[start_i:start_i + size] = [file.file] * size
+
+    return compacted
+
+
+def checksum(disk: Disk | ExtentDisk) -> int:
+    if isinstance(disk, ExtentDisk):
+        return checksum_extents(disk)
+
     cs = 0
     for i in range(len(disk)):
         cs += disk[i] * i if disk[i] != EMPTY else 0
     return cs
 
-EXAMPLE_INPUT = "2333133121414131402"
 
-def benchmark_setup():
-    global g_input, g_disk 
-    g_input = ""
-    with open_input(filename="input.txt") as f:
-        g_input = f.read().strip()
+# Extent representation
+# - a per-block list holds a pointer per block, even though every block of a file is the same.
+#   The disk map already describes each file as one run of blocks, so keep just that:
+#   the start, length and id of each file, with free space implied by the gaps between them.
+# - memory and time are then linear in the number of files rather than the number of blocks
+
+@dataclass
+class ExtentDisk():
+    """Files on a disk as runs of blocks. Entry i of each array describes one extent.
+    Extents never overlap, but a compacted disk's extents aren't necessarily in disk order,
+    and a fragmented file has more than one extent."""
+    # total number of blocks on the disk, including trailing free space
+    size: int
+    start: array = field(default_factory=lambda: array('q'))
+    length: array = field(default_factory=lambda: array('q'))
+    file: array = field(default_factory=lambda: array('q'))
+
+
+    def append(self, start_i: int, length: int, file: int):
+        self.start.append(start_i)
+        self.length.append(length)
+        self.file.append(file)
+
+
+    def to_blocks(self) -> Disk:
+        """Expands the extents into a per-block disk"""
+        disk: Disk = [EMPTY] * self.size
+        for start_i, length, file in zip(self.start, self.length, self.file):
+            disk[start_i:start_i + length] = [file] * length
+        return disk
+
+
+def parse_extents(input: str) -> ExtentDisk:
+    """Like parse_input, but without expanding the disk map into blocks."""
+    return parse_extents_bytes(input.encode('ascii'))
+
+
+def parse_extents_bytes(buf) -> ExtentDisk:
+    """Like parse_extents, for a buffer of ASCII digits such as an mmap from input.open_input_mmap.
+    Whitespace around the disk map is ignored."""
+    zero = ord('0')
+    with strip(buf) as view:
+        assert len(view) > 0, f"Input must have at least one file"
+
+        disk = ExtentDisk(0)
+        curr_i = 0
+        for file_id, sizes in enumerate(it.batched(view, n=2)):
+            for digit in sizes:
+                if not zero <= digit <= zero + 9:
+                    raise ValueError(f"Expected a digit in the disk map, got {chr(digit)!r}")
+            file_size = sizes[0] - zero
+            if file_size > 0:
+                disk.append(curr_i, file_size, file_id)
+            curr_i += file_size
+            curr_i += sizes[1] - zero if len(sizes) > 1 else 0
+        disk.size = curr_i
+
+    return disk
+
+
+def compact_extents(disk: ExtentDisk) -> ExtentDisk:
+    """Returns a compacted copy of disk, moving blocks from the last file into the leftmost gap.
+    disk must be in disk order, as returned by parse_extents."""
+    compacted = ExtentDisk(disk.size)
+    start, length, file = disk.start, disk.length, disk.file
+
+    # right_i is the file blocks are taken from, which has remaining blocks left unmoved
+    right_i = len(start) - 1
+    remaining = length[right_i] if right_i >= 0 else 0
+    for left_i in range(len(start)):
+        if left_i > right_i:
+            break
+        if left_i == right_i:
+            # the last file to move ends up just where it started, minus the moved blocks
+            if remaining > 0:
+                compacted.append(start[left_i], remaining, file[left_i])
+            break
+
+        compacted.append(start[left_i], length[left_i], file[left_i])
+        # fill the gap between this file and the next with blocks from the back
+        gap_i = start[left_i] + length[left_i]
+        gap_size = start[left_i + 1] - gap_i
+        while gap_size > 0 and right_i > left_i:
+            moved = min(gap_size, remaining)
+            compacted.append(gap_i, moved, file[right_i])
+            gap_i += moved
+            gap_size -= moved
+            remaining -= moved
+            if remaining == 0:
+                right_i -= 1
+                remaining = length[right_i] if right_i > left_i else 0
+
+    return compacted
+
+
+def compact_pt2_extents(disk: ExtentDisk) -> ExtentDisk:
+    """Returns a compacted copy of disk without fragmenting files, like compact_pt2_segment_tree.
+    disk must be in disk order, as returned by parse_extents."""
+    start, length = disk.start, disk.length
+    gaps = [Interval(start[i] + length[i], start[i + 1] - 1, EMPTY)
+            for i in range(len(start) - 1)
+            if start[i] + length[i] < start[i + 1]]
+    free_spans = FreeSpanIndex(gaps)
+
+    compacted = ExtentDisk(disk.size, array('q', start), array('q', length), array('q', disk.file))
+    moved_start = compacted.start
+    for file_i in range(len(start) - 1, -1, -1):
+        if (span_i := free_spans.leftmost(length[file_i], start[file_i])) is not None:
+            moved_start[file_i] = free_spans.allocate(span_i, length[file_i])
+
+    return compacted
+
+
+def checksum_extents(disk: ExtentDisk) -> int:
+    """Sums file id * block index for each extent as an arithmetic series, instead of per block:
+    the indices start..start + length - 1 sum to start * length + length * (length - 1) / 2."""
+    cs = 0
+    for start_i, length, file in zip(disk.start, disk.length, disk.file):
+        cs += file * (start_i * length + length * (length - 1) // 2)
+    return cs
+
+
+# NumPy engine
+# - the per-block representation again, but as an int64 array so that parse, compact and
+#   checksum are each a handful of whole-array operations instead of python loops
+
+def parse_numpy(input: str) -> np.ndarray:
+    """Like parse_input, but returns the blocks as a numpy array."""
+    assert len(input) > 0, f"Input must have at least one file"
+
+    sizes = np.frombuffer(input.encode('ascii'), dtype=np.uint8) - ord('0')
+    # even digits are files, with ids counting up from 0. Odd digits are free space.
+    digit_i = np.arange(len(sizes), dtype=np.int64)
+    ids = np.where(digit_i % 2 == 0, digit_i // 2, EMPTY)
+    return np.repeat(ids, sizes)
+
+
+def compact_numpy(disk: np.ndarray) -> np.ndarray:
+    """Returns a compacted copy of disk, like compact.
+    Once compacted, the first file_count blocks hold every file block. So each free block in
+    that prefix gets one of the file blocks after it, taking them from the back."""
+    file_count = int(np.count_nonzero(disk != EMPTY))
+    free_i = np.flatnonzero(disk[:file_count] == EMPTY)
+    moved_i = np.flatnonzero(disk[file_count:] != EMPTY) + file_count
+
+    compacted = disk.copy()
+    compacted[free_i] = disk[moved_i[::-1]]
+    compacted[file_count:] = EMPTY
+    return compacted
+
+
+def checksum_numpy(disk: np.ndarray) -> int:
+    """Like checksum, as a dot product of the file ids with the block indices.
+    The dot product is chunked so that no partial sum can overflow int64."""
+    ids = np.where(disk != EMPTY, disk, 0)
+    max_product = max(int(ids.max(initial=0)) * len(ids), 1)
+    chunk_size = max(2 ** 62 // max_product, 1)
+
+    cs = 0
+    for chunk_start in range(0, len(ids), chunk_size):
+        chunk = ids[chunk_start:chunk_start + chunk_size]
+        cs += int(np.dot(chunk, np.arange(chunk_start, chunk_start + len(chunk), dtype=np.int64)))
+    return cs
+
+
+# Streaming
+# - part 1 only pairs free blocks from the front with file blocks from the back, so two
+#   pointers into the disk map itself are enough: the left one walks forwards over files
+#   and free space, the right one walks backwards over files, filling the free space.
+# - nothing is materialized, so extra memory is constant. The disk map is read through an
+#   mmap, which only pages in the parts the pointers touch.
+
+def checksum_streaming(disk_map: bytes) -> int:
+    """Returns the checksum of the disk after compact, straight from the disk map.
+    disk_map is any bytes-like sequence of ASCII digits, e.g. bytes or an mmap.
+    Trailing whitespace is ignored."""
+    zero = ord('0')
+    end_i = len(disk_map)
+    while end_i > 0 and not zero <= disk_map[end_i - 1] <= zero + 9:
+        end_i -= 1
+    if end_i == 0:
+        return 0
+
+    def blocks(digit_i: int, first_block_i: int, size: int) -> int:
+        # sum of the checksum over size blocks of the file at digit_i, as an arithmetic series
+        return digit_i // 2 * (first_block_i * size + size * (size - 1) // 2)
+
+    # right_i is the digit of the file blocks are taken from, which has remaining blocks unmoved
+    right_i = end_i - 1 if (end_i - 1) % 2 == 0 else end_i - 2
+    remaining = disk_map[right_i] - zero
+    cs = 0
+    block_i = 0
+    left_i = 0
+    while left_i < right_i:
+        size = disk_map[left_i] - zero
+        if left_i % 2 == 0:
+            cs += blocks(left_i, block_i, size)
+            block_i += size
+        else:
+            while size > 0 and right_i > left_i:
+                moved = min(size, remaining)
+                cs += blocks(right_i, block_i, moved)
+                block_i += moved
+                size -= moved
+                remaining -= moved
+                if remaining == 0:
+                    right_i -= 2
+                    remaining = disk_map[right_i] - zero if right_i > left_i else 0
+        left_i += 1
+
+    if left_i == right_i:
+        # whatever wasn't moved from the last file stays where it is
+        cs += blocks(right_i, block_i, remaining)
+    return cs
+
+
+def solve_pt1_streaming(filename = 'input.txt') -> int:
+    """Solves part 1 for an input file of any size, without reading it into memory."""
+    with open_input_mmap(filename=filename, year=YEAR, day=DAY) as disk_map:
+        return checksum_streaming(disk_map)
+
+
+def solve_pt1(input: str, engine = 'extents') -> int:
+    """Solves part 1 with the chosen engine: 'blocks', 'extents', 'numpy' or 'streaming'."""
+    match engine:
+        case 'blocks':
+            return checksum(compact(parse_input(input)))
+        case 'extents':
+            return checksum(compact(parse_extents(input)))
+        case 'numpy':
+            if np is None:
+                raise ValueError("The numpy engine requires numpy to be installed")
+            return checksum_numpy(compact_numpy(parse_numpy(input)))
+        case 'streaming':
+            return checksum_streaming(input.encode('ascii'))
+        case _:
+            raise ValueError(f"Unknown engine {engine}")
+
+
+def parse(input: str) -> ExtentDisk:
+    return parse_extents(input)
+
 
-    g_disk = parse_input(g_input)
+def parse_bytes(buf) -> ExtentDisk:
+    """Like parse, for a buffer such as an mmap from input.open_input_mmap"""
+    return parse_extents_bytes(buf)
+
+
+def part1(disk: ExtentDisk) -> int:
+    return checksum(compact(disk))
+
+
+def part2(disk: ExtentDisk) -> int:
+    return checksum(compact_pt2_extents(disk))
+
+
+# solver variants measured by bench.py. The per-block variants need the per-block parse.
+BENCHMARKS = {
+    'compact': (parse_input, compact),
+    'compact_pt2': (parse_input, compact_pt2),
+    'compact_pt2_try2': (parse_input, compact_pt2_try2),
+    'compact_pt2_segment_tree': (parse_input, compact_pt2_segment_tree),
+    'compact_extents': compact_extents,
+    'compact_pt2_extents': compact_pt2_extents,
+    'checksum_streaming': (lambda input: input.encode('ascii'), checksum_streaming),
+}
+if np is not None:
+    BENCHMARKS['compact_numpy'] = (parse_numpy, compact_numpy)
+    BENCHMARKS['checksum_numpy'] = (parse_numpy, checksum_numpy)
+# compact_pt2 takes close to a minute per call on the real input
+SLOW_BENCHMARKS = {'compact_pt2'}
+
+
+EXAMPLE_INPUT = "2333133121414131402"
 
 def main():
-    input = ""
-    with open_input(filename="input.txt") as f:
-        input = f.read().strip()
+    input = read_input(YEAR, DAY)
 
     input = EXAMPLE_INPUT
     disk = parse_input(input)
 
     compacted = compact(disk)
-    compacted_pt2 = compact_pt2_try2(disk)
+    compacted_pt2 = compact_pt2_segment_tree(disk)
     print(f"Disk:\t\t{render_disk(disk)}")
     print(f"Expected:\t00...111...2...333.44.5555.6666.777.888899")
     print(f"Compacted:\t{render_disk(compacted)}")
@@ -272,15 +638,5 @@ if __name__ == "__main__":
 
     # main()
     
-    import timeit
-    num = 10
-    result_pt1 = timeit.timeit("compact(g_disk)", globals=locals(), setup="benchmark_setup()", number=num)
-    print(f"pt 1 avg time to compact: {result_pt1 / num * 1000:.2f} ms")
-    # result_pt2 = timeit.timeit("compact_pt2(g_disk)", globals=locals(), setup="benchmark_setup()", number=num)
-    # print(f"pt 2 avg time to compact: {result_pt2 / num * 1000:.2f} ms")
-    result_pt2_try2 = timeit.timeit("compact_pt2_try2(g_disk)", globals=locals(), setup="benchmark_setup()", number=num)
-    print(f"pt 2 try 2 avg time to compact: {result_pt2_try2 / num * 1000:.2f} ms")
-
-    # pt 1 avg time to compact: 10.481464999975287 ms
-    # pt 2 avg time to compact: 52741.53534489997 ms
-    # pt 2 try 2 avg time to compact: 485.50 ms
+    import bench
+    bench.main(['--day', str(DAY), '--repeat', '10'])
@@ -0,0 +1,50 @@
+import bench
+import runner
+import unittest
+
+
+class TestPercentile(unittest.TestCase):
+    def test_p95OfTwenty_isSecondLargest(self):
+        samples = [float(i) for i in range(20, 0, -1)]
+
+        self.assertEqual(bench.percentile(samples, 95), 19.0)
+
+
+    def test_singleSample(self):
+        self.assertEqual(bench.percentile([3.0], 95), 3.0)
+
+
+class TestVariants(unittest.TestCase):
+    def test_moduleWithoutBenchmarks_usesParts(self):
+        self.assertEqual(list(bench.variants(runner.load(2024, 1))), ['part1', 'part2'])
+
+
+    def test_slowVariants_skippedByDefault(self):
+        solution = runner.load(2024, 9)
+
+        self.assertNotIn('compact_pt2', bench.variants(solution))
+        self.assertIn('compact_pt2', bench.variants(solution, include_slow=True))
+
+
+class TestRun(unittest.TestCase):
+    def test_reportsEachMatchingVariant(self):
+        stats = list(bench.run([runner.load(2024, 7)], 'example.txt', 'backwards', warmup=0, repeat=3))
+
+        self.assertEqual([s.variant for s in stats], ['satisfies_backwards', 'satisfies_backwards_con'])
+        for s in stats:
+            self.assertLessEqual(s.min, s.median)
+            self.assertLessEqual(s.median, s.p95)
+            self.assertGreater(s.peak_memory, 0)
+            self.assertIsNone(s.throughput)
+
+
+    def test_reportsThroughput_withBenchmarkSize(self):
+        stats = list(bench.run([runner.load(2024, 10)], 'input.txt', 'find_trails_bfs', warmup=0, repeat=1))
+
+        self.assertEqual(len(stats), 1)
+        self.assertEqual(stats[0].unit, 'cells')
+        self.assertGreater(stats[0].throughput, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import generate as gen
+import runner
+import unittest
+
+
+class TestGenerate(unittest.TestCase):
+    def test_sameSeed_isDeterministic(self):
+        for day in gen.GENERATORS:
+            self.assertEqual(gen.generate(day, 20, seed=3), gen.generate(day, 20, seed=3))
+
+
+    def test_everyDay_solvesGeneratedInput(self):
+        for (_year, day), solution in runner.discover(2024).items():
+            with self.subTest(day=day):
+                parsed = solution.parse(gen.generate(day, 12))
+                solution.part1(parsed)
+                solution.part2(parsed)
+
+
+    def test_day5_rulesAreAcyclic(self):
+        import solution2024_5 as sol5
+        graph, updates = sol5.parse(gen.generate(5, 50))
+
+        for update in updates:
+            self.assertIsNotNone(sol5.topological_sort(set(update), graph))
+
+
+    def test_day6_singleGuard(self):
+        lab = gen.generate(6, 40, seed=1)
+
+        self.assertEqual(sum(lab.count(c) for c in '^>v<'), 1)
+
+
+    def test_day6_guardLeaves(self):
+        import solution2024_6 as sol6
+        for size in [1, 2, 7, 25, 60]:
+            for seed in range(120):
+                with self.subTest(size=size, seed=seed):
+                    jg = sol6.JumpGrid.from_grid(sol6.parse(gen.generate(6, size, seed)))
+                    self.assertFalse(jg.loops())
+
+
+    def test_day6_seedsThatUsedToLoop(self):
+        import solution2024_6 as sol6
+        for size, seed in [(25, 44), (50, 25), (100, 7)]:
+            with self.subTest(size=size, seed=seed):
+                self.assertGreater(sol6.part1(sol6.parse(gen.generate(6, size, seed))), 0)
+
+
+    def test_day2_levelsStayInDomain(self):
+        for seed in range(20):
+            for report in gen.generate(2, 200, seed).splitlines():
+                self.assertTrue(all(1 <= int(level) <= 99 for level in report.split()))
+
+
+    def test_day9_endsOnFileWithNonEmptyFiles(self):
+        disk_map = gen.generate(9, 1000)
+
+        self.assertEqual(len(disk_map), 1999)
+        self.assertNotIn('0', disk_map[::2])
+
+
+    def test_day10_squareMapOfHeights(self):
+        lines = gen.generate(10, 30).splitlines()
+
+        self.assertEqual(len(lines), 30)
+        self.assertTrue(all(len(l) == 30 and l.isdigit() for l in lines))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import grid
+import unittest
+
+
+class TestPaddedGrid(unittest.TestCase):
+    def setUp(self):
+        self.g = grid.PaddedGrid.from_str("ab\ncd\nef")
+
+
+    def test_dimensionsExcludePadding(self):
+        self.assertEqual((self.g.row_count, self.g.col_count), (3, 2))
+        self.assertEqual(len(self.g.cells), 5 * 4)
+
+
+    def test_str_roundTrips(self):
+        self.assertEqual(str(self.g), "ab\ncd\nef")
+
+
+    def test_indexAndPosition_areInverse(self):
+        for row in range(-1, 4):
+            for col in range(-1, 3):
+                self.assertEqual(self.g.position(self.g.index(row, col)), (row, col))
+
+
+    def test_neighborsOffEdge_arePadding(self):
+        up, right, down, left = self.g.offsets()
+        corner = self.g.index(0, 0)
+
+        self.assertEqual(self.g.cells[corner + right], ord('b'))
+        self.assertEqual(self.g.cells[corner + down], ord('c'))
+        self.assertEqual(self.g.cells[corner + up], grid.PADDING)
+        self.assertEqual(self.g.cells[corner + left], grid.PADDING)
+
+
+    def test_widePadding_coversDiagonalReach(self):
+        g = grid.PaddedGrid.from_str("x", pad=3, fill=ord('.'))
+
+        for offset in g.offsets(grid.ALL_DIRECTIONS):
+            self.assertEqual(g.cells[g.index(0, 0) + 3 * offset], ord('.'))
+
+
+    def test_indices_visitsInteriorInOrder(self):
+        self.assertEqual(bytes(self.g.cells[i] for i in self.g.indices()), b"abcdef")
+
+
+    def test_findAll(self):
+        g = grid.PaddedGrid.from_str("0120\n3400")
+
+        self.assertEqual([g.position(i) for i in g.find_all(ord('0'))], [(0, 0), (0, 3), (1, 2), (1, 3)])
+
+
+    def test_raggedRows_raise(self):
+        with self.assertRaises(ValueError):
+            grid.PaddedGrid.from_str("abc\nde")
+
+
+    def test_blankLinesAroundGrid_areIgnored(self):
+        for buf in [b"0123\n1234\n\n", b"\n0123\n1234", b"\r\n0123\r\n1234\r\n\r\n"]:
+            with self.subTest(buf=buf):
+                self.assertEqual(str(grid.PaddedGrid.from_bytes(buf)), "0123\n1234")
+
+
+if __name__ == "__main__":
+    unittest.main()
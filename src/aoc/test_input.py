@@ -0,0 +1,103 @@
+import generate as gen
+import importlib
+import input as inp
+import mmap
+import os
+import tempfile
+import unittest
+
+
+class TestIterLines(unittest.TestCase):
+    def test_splitsOnNewlines_matchesSplitlines(self):
+        buf = b"12\n345\n\n6\n"
+
+        lines = [bytes(l) for l in inp.iter_lines(buf)]
+
+        self.assertEqual(lines, buf.splitlines())
+
+
+    def test_noTrailingNewline_yieldsLastLine(self):
+        lines = [bytes(l) for l in inp.iter_lines(b"ab\ncd")]
+
+        self.assertEqual(lines, [b"ab", b"cd"])
+
+
+    def test_crlf_stripsCarriageReturn(self):
+        lines = [bytes(l) for l in inp.iter_lines(b"ab\r\ncd\r\n")]
+
+        self.assertEqual(lines, [b"ab", b"cd"])
+
+
+    def test_mmap_viewsDontCopy(self):
+        with tempfile.TemporaryFile() as f:
+            f.write(b"MMMSXXMASM\nMSAMXMSMSA\n")
+            f.flush()
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                lines = list(inp.iter_lines(buf))
+
+                self.assertEqual(len(lines), 2)
+                self.assertEqual(lines[1].obj, buf)
+                self.assertEqual(lines[1].tobytes(), b"MSAMXMSMSA")
+                for l in lines:
+                    l.release()
+
+
+    def test_strippedView_isSearchedToo(self):
+        with inp.strip(b"\n ab\ncd\n\n") as view:
+            lines = [bytes(l) for l in inp.iter_lines(view)]
+
+        self.assertEqual(lines, [b"ab", b"cd"])
+
+
+class TestIterTokens(unittest.TestCase):
+    def test_whitespace_skipsEmptyTokens(self):
+        tokens = [bytes(t) for t in inp.iter_tokens(b"190: 10  19\n3267: 81 40 27\n")]
+
+        self.assertEqual(tokens, [b"190:", b"10", b"19", b"3267:", b"81", b"40", b"27"])
+
+
+    def test_customDelimiters(self):
+        tokens = [bytes(t) for t in inp.iter_tokens(b"75,47,61\n53|29", b",|\n")]
+
+        self.assertEqual(tokens, [b"75", b"47", b"61", b"53", b"29"])
+
+
+class TestStrip(unittest.TestCase):
+    def test_stripsBothEnds(self):
+        self.assertEqual(inp.strip(b"\n 2333133121414131402\r\n").tobytes(), b"2333133121414131402")
+
+
+    def test_allWhitespace_isEmpty(self):
+        self.assertEqual(len(inp.strip(b" \n")), 0)
+
+
+
+class TestOpenInputMmap(unittest.TestCase):
+    def write_input(self, day: int, contents: str) -> str:
+        filename = 'synthetic_mmap_test.txt'
+        path = inp.input_path(filename=filename, year=gen.YEAR, day=day)
+        with open(path, 'w') as f:
+            f.write(contents)
+        self.addCleanup(os.remove, path)
+        return filename
+
+
+    def test_emptyFile_raises(self):
+        filename = self.write_input(1, '')
+
+        with self.assertRaisesRegex(ValueError, 'empty'):
+            inp.open_input_mmap(filename=filename, year=gen.YEAR, day=1)
+
+
+    def test_parseBytes_matchesParse(self):
+        for day in [3, 4, 6, 8, 9, 10]:
+            sol = importlib.import_module(f'solution{gen.YEAR}_{day}')
+            input = gen.generate(day, 20, seed=day)
+            filename = self.write_input(day, input + '\n')
+            with self.subTest(day=day), inp.open_input_mmap(filename=filename, year=gen.YEAR, day=day) as buf:
+                self.assertEqual(sol.part1(sol.parse_bytes(buf)), sol.part1(sol.parse(input)))
+                self.assertEqual(sol.part2(sol.parse_bytes(buf)), sol.part2(sol.parse(input)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,26 @@
+import runner
+import unittest
+
+
+class TestDiscover(unittest.TestCase):
+    def test_findsAll2024Days(self):
+        registry = runner.discover(2024)
+
+        self.assertEqual(list(registry.keys()), [(2024, day) for day in range(1, 11)])
+
+
+    def test_solutionsExposeYearAndDay(self):
+        for (year, day), solution in runner.discover(2024).items():
+            self.assertEqual((solution.module.YEAR, solution.module.DAY), (year, day))
+
+
+class TestRun(unittest.TestCase):
+    def test_day7Example_solvesBothParts(self):
+        result = runner.run(runner.load(2024, 7), 'example.txt')
+
+        self.assertEqual(result.part1, 3749)
+        self.assertEqual(result.part2, 11387)
+
+
+if __name__ == "__main__":
+    unittest.main()
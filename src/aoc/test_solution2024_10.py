@@ -0,0 +1,98 @@
+import generate as gen
+import solution2024_10 as sol
+import unittest
+
+EXAMPLE = """
+89010123
+78121874
+87430965
+96549874
+45678903
+32019012
+01329801
+10456732
+""".strip()
+
+
+class TestTrailDp(unittest.TestCase):
+    def test_example(self):
+        m = sol.parse(EXAMPLE)
+
+        self.assertEqual(sol.part1(m), 36)
+        self.assertEqual(sol.part2(m), 81)
+
+
+    def test_deadEnds_scoreZero(self):
+        m = sol.parse("0123\n1111\n9876")
+
+        self.assertEqual(m.find_trails_dp(), {sol.Dim(0, 0): 0})
+        self.assertEqual(m.find_trails_dp(count_all_paths=True), {sol.Dim(0, 0): 0})
+
+
+    def test_generatedMaps_matchDfs(self):
+        for seed in range(5):
+            m = sol.parse(gen.generate(sol.DAY, 30, seed))
+
+            self.assertEqual(m.find_trails_dp(), m.find_trails())
+            self.assertEqual(m.find_trails_dp(count_all_paths=True), m.find_trails(count_all_paths=True))
+
+
+    def test_unknownEngine_raises(self):
+        with self.assertRaises(ValueError):
+            sol.parse(EXAMPLE).find_trails(engine='astar')
+
+
+class TestBitsets(unittest.TestCase):
+    def test_batches_matchDp(self):
+        m = sol.parse(gen.generate(sol.DAY, 40, 1))
+        expected = m.find_trails_dp()
+
+        for batch_bits in [1, 7, sol.BITSET_BATCH]:
+            self.assertEqual(m.find_trails_bitsets(batch_bits), expected)
+
+
+    def test_example(self):
+        m = sol.parse(EXAMPLE)
+
+        self.assertEqual(sum(m.find_trails_bitsets().values()), 36)
+        self.assertEqual(m.sum_scores_bitsets(batch_bits=3), 36)
+
+
+class TestBfs(unittest.TestCase):
+    def test_example(self):
+        m = sol.parse(EXAMPLE)
+
+        self.assertEqual(m.find_trails(engine='bfs'), m.find_trails_dijkstra())
+
+
+    def test_batches_matchDijkstra(self):
+        m = sol.parse(gen.generate(sol.DAY, 40, 2))
+        expected = m.find_trails_dijkstra()
+
+        for batch_bits in [1, 5, sol.BITSET_BATCH]:
+            self.assertEqual(m.find_trails_bfs(batch_bits), expected)
+
+
+@unittest.skipIf(sol.np is None, "numpy is not installed")
+class TestNumpyEngine(unittest.TestCase):
+    def test_example(self):
+        m = sol.parse(EXAMPLE)
+
+        self.assertEqual(m.sum_ratings_numpy(), 81)
+        self.assertEqual(m.find_trails(count_all_paths=True, engine='numpy'), m.find_trails(count_all_paths=True))
+
+
+    def test_generatedMaps_matchDp(self):
+        for seed in range(3):
+            m = sol.parse(gen.generate(sol.DAY, 50, seed))
+
+            self.assertEqual(m.find_trails_numpy(), m.find_trails_dp(count_all_paths=True))
+
+
+    def test_scores_raise(self):
+        with self.assertRaises(ValueError):
+            sol.parse(EXAMPLE).find_trails(engine='numpy')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import generate as gen
+import solution2024_4 as sol
+import unittest
+
+EXAMPLE = """
+MMMSXXMASM
+MSAMXMSMSA
+AMXSXMAAMM
+MSAMASMSMX
+XMASAMXAMM
+XXAMMXXAMA
+SMSMSASXSS
+SAXAMASAAA
+MAMMMXMMMM
+MXMXAXMASX
+""".strip()
+
+
+def reference_count(ws: str, word: str) -> int:
+    lines = ws.splitlines()
+    rows, cols = len(lines), len(lines[0])
+    return sum(all(0 <= r + k * dr < rows and 0 <= c + k * dc < cols and lines[r + k * dr][c + k * dc] == letter
+                   for k, letter in enumerate(word))
+               for r in range(rows) for c in range(cols) for dr, dc in sol.DIRECTION_NAMES)
+
+
+class TestDirectionScan(unittest.TestCase):
+    def test_example(self):
+        self.assertEqual(sol.part1(sol.parse(EXAMPLE)), 18)
+
+
+    def test_example_byDirection(self):
+        self.assertEqual(sol.count_word_by_direction(EXAMPLE, "XMAS"), {
+            "forward": 3, "backward": 2, "down": 1, "up": 2,
+            "down_right": 1, "down_left": 1, "up_right": 4, "up_left": 4,
+        })
+
+
+    def test_wordsDontWrapAcrossLines(self):
+        ws = "..XM\nAS..\n...."
+
+        self.assertEqual(sol.part1(ws), 0)
+        self.assertEqual(sol.part1_regex(ws), 1)
+
+
+    def test_arbitraryWords_matchReference(self):
+        ws = gen.generate(4, 25, seed=1)
+
+        for word in ["X", "AS", "SAX", "XMAS", "MASMAS", "XMASXMASXMASXMASXMASXMASXMAS"]:
+            with self.subTest(word=word):
+                self.assertEqual(sol.count_word(ws, word), reference_count(ws, word))
+
+
+    def test_emptyWord_raises(self):
+        with self.assertRaises(ValueError):
+            sol.count_word(EXAMPLE, "")
+
+
+class TestAhoCorasick(unittest.TestCase):
+    def test_overlappingPatterns(self):
+        automaton = sol.AhoCorasick([b"he", b"she", b"his", b"hers"])
+
+        self.assertEqual(automaton.count(b"ushers ahishe"), [2, 2, 1, 1])
+
+
+    def test_example(self):
+        self.assertEqual(sol.count_words(EXAMPLE, ["XMAS"]), {"XMAS": 18})
+
+
+    def test_dictionary_matchesDirectionScan(self):
+        ws = gen.generate(4, 25, seed=2)
+        words = ["X", "AS", "SAS", "XMAS", "MAS", "SAM", "MASMAS", "XMASXMASXMASXMASXMASXMASXMAS"]
+
+        counts = sol.count_words(ws, words)
+
+        for word in words:
+            with self.subTest(word=word):
+                self.assertEqual(counts[word], sol.count_word(ws, word))
+
+
+    def test_wordsDontWrapAcrossLines(self):
+        self.assertEqual(sol.count_words("..XM\nAS..\n....", ["XMAS"]), {"XMAS": 0})
+
+
+if __name__ == "__main__":
+    unittest.main()
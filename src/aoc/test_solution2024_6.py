@@ -0,0 +1,156 @@
+import generate as gen
+import solution2024_6 as sol
+import unittest
+
+
+EXAMPLE = """
+....#.....
+.........#
+..........
+..#.......
+.......#..
+..........
+.#..^.....
+........#.
+#.........
+......#...
+""".strip()
+
+
+def reference_walk(input: str, extra_obstacle: tuple[int, int] | None = None) -> set[tuple[int, int]] | None:
+    """Simulates the guard one step at a time.
+    Returns the visited cells, or None if the guard loops."""
+    lines = input.splitlines()
+    rows, cols = len(lines), len(lines[0])
+    pos = next((r, c) for r in range(rows) for c in range(cols) if lines[r][c] == '^')
+    steps = [(-1, 0), (0, 1), (1, 0), (0, -1)]
+    dir = 0
+    states = set()
+    while (pos, dir) not in states:
+        states.add((pos, dir))
+        row, col = pos[0] + steps[dir][0], pos[1] + steps[dir][1]
+        if not (0 <= row < rows and 0 <= col < cols):
+            return {p for p, _d in states}
+        if lines[row][col] == '#' or (row, col) == extra_obstacle:
+            dir = (dir + 1) % 4
+        else:
+            pos = (row, col)
+    return None
+
+
+def reference_obstacles(input: str) -> set[complex]:
+    start = next((r, l.index('^')) for r, l in enumerate(input.splitlines()) if '^' in l)
+    return {p[0] + 1j * p[1] for p in reference_walk(input)
+            if p != start and reference_walk(input, p) is None}
+
+
+class TestGrid(unittest.TestCase):
+    def test_str_roundTrips(self):
+        self.assertEqual(str(sol.to_grid(EXAMPLE)), EXAMPLE)
+
+
+    def test_copy_isIndependent(self):
+        g = sol.to_grid(EXAMPLE)
+        copy = g.copy()
+
+        copy.mark(copy.to_pos(0, 0), sol.MapLabel.OBSTACLE)
+
+        self.assertEqual(g.label(g.to_pos(0, 0)), sol.MapLabel.EMPTY)
+
+
+    def test_runGrid_example(self):
+        g = sol.to_grid(EXAMPLE)
+
+        self.assertEqual(sol.run_grid(g), 41)
+        self.assertFalse(g.in_bounds())
+        self.assertEqual(str(g).count(sol.MapLabel.TRAVERSED), 41)
+
+
+    def test_next_turnsAtObstacle(self):
+        g = sol.to_grid("#..\n^..")
+
+        _g, result = g.next()
+
+        self.assertEqual(result, sol.Grid.NextResult.TURN)
+        self.assertEqual(str(g), "#..\n>..")
+
+
+    def test_twoGuards_raises(self):
+        with self.assertRaises(ValueError):
+            sol.to_grid("^.\n.>")
+
+
+class TestJumpEngine(unittest.TestCase):
+    def test_example_part1(self):
+        self.assertEqual(sol.part1(sol.parse(EXAMPLE)), 41)
+
+
+    def test_example_obstacles(self):
+        obstacles = sol.place_obstacles_fast(sol.parse(EXAMPLE))
+
+        self.assertEqual(set(obstacles), {6+3j, 7+6j, 7+7j, 8+1j, 8+3j, 9+7j})
+
+
+    def test_guardFacingObstacle_turnsInPlace(self):
+        g = sol.parse("#..\n^..\n...")
+
+        self.assertEqual(sol.part1(g), 3)
+
+
+    def test_exitFromFirstCell(self):
+        # the guard's last cell is (0, 0), leaving up or left
+        for input, expected in [("^.\n..", 1), (".#\n^.", 2), ("<.\n..", 1), (".<\n..", 2)]:
+            with self.subTest(input=input):
+                g = sol.parse(input)
+                self.assertEqual(sol.part1(g), expected)
+                self.assertEqual(sol.part1(g), sol.run_grid(g.copy()))
+
+
+    def test_smallGeneratedGrids_matchReference(self):
+        for size in range(1, 9):
+            for seed in range(60):
+                input = gen.generate(6, size, seed)
+                with self.subTest(size=size, seed=seed):
+                    self.assertEqual(sol.part1(sol.parse(input)), len(reference_walk(input)))
+
+
+    def test_generatedGrids_matchReference(self):
+        for seed in range(8):
+            input = gen.generate(6, 25, seed)
+            g = sol.parse(input)
+
+            self.assertEqual(sol.part1(g), len(reference_walk(input)))
+            self.assertEqual(set(sol.place_obstacles_fast(g)), reference_obstacles(input))
+            self.assertEqual(set(sol.place_obstacles_fast(g, resume=False)), reference_obstacles(input))
+
+
+    def test_firstContacts_coverVisitedCells(self):
+        jg = sol.JumpGrid.from_grid(sol.parse(EXAMPLE))
+        contacts = jg.first_contacts()
+
+        self.assertEqual(len(contacts), 40)
+        visited = jg.visited()
+        for cell, pos, dir in contacts:
+            self.assertTrue(visited[cell])
+            self.assertEqual(pos + jg.steps()[dir], cell)
+
+
+    def test_loopingGuard_raises(self):
+        jg = sol.JumpGrid.from_grid(sol.parse(".#..\n...#\n#^..\n..#."))
+
+        self.assertTrue(jg.loops())
+        with self.assertRaises(ValueError):
+            jg.visited()
+        with self.assertRaises(ValueError):
+            jg.first_contacts()
+
+
+class TestParallel(unittest.TestCase):
+    def test_matchesSerial_inContactOrder(self):
+        g = sol.parse(gen.generate(6, 40, seed=2))
+
+        self.assertEqual(sol.place_obstacles_parallel(g, workers=2), sol.place_obstacles_fast(g))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+import generate as gen
+import solution2024_7 as sol
+import unittest
+
+EXAMPLE = """
+190: 10 19
+3267: 81 40 27
+83: 17 5
+156: 15 6
+7290: 6 8 6 15
+161011: 16 10 13
+192: 17 8 14
+21037: 9 7 18 13
+292: 11 6 16 20
+""".strip()
+
+ALL_OPS = [sol.Op.ADD, sol.Op.MUL, sol.Op.CON]
+
+
+class TestSatisfiesBackwards(unittest.TestCase):
+    def test_example(self):
+        eqs = sol.parse(EXAMPLE)
+
+        self.assertEqual(sol.part1(eqs), 3749)
+        self.assertEqual(sol.part2(eqs), 11387)
+
+
+    def test_concatShift(self):
+        self.assertEqual([sol.concat_shift(o) for o in [0, 1, 9, 10, 99, 100, 12345]],
+                         [10, 10, 10, 100, 100, 1000, 100000])
+
+
+    def test_concatOfZero(self):
+        eq = sol.Equation(120, [12, 0])
+
+        self.assertTrue(sol.satisfies_backwards(eq, ALL_OPS))
+        self.assertTrue(sol.satisfies(eq, ALL_OPS))
+
+
+    def test_mulByZero(self):
+        for eq in [sol.Equation(7, [3, 0, 7]), sol.Equation(0, [5, 0]), sol.Equation(0, [5, 0, 3])]:
+            for ops in [[sol.Op.ADD, sol.Op.MUL], ALL_OPS]:
+                with self.subTest(eq=eq, ops=ops):
+                    self.assertEqual(sol.satisfies_backwards(eq, ops), sol.satisfies(eq, ops))
+        self.assertTrue(sol.satisfies_backwards(sol.Equation(7, [3, 0, 7])))
+        self.assertTrue(sol.satisfies_backwards(sol.Equation(0, [5, 0])))
+        self.assertTrue(sol.satisfies_backwards(sol.Equation(0, [5, 0, 3])))
+
+
+    def test_generated_matchesForwardSearch(self):
+        for eq in sol.parse(gen.generate(sol.DAY, 300, 3)):
+            if len(eq.operands) > 8:
+                continue
+            with self.subTest(eq=eq):
+                self.assertEqual(sol.satisfies_backwards(eq), sol.satisfies(eq))
+                self.assertEqual(sol.satisfies_backwards(eq, ALL_OPS), sol.satisfies(eq, ALL_OPS))
+
+
+class TestStreaming(unittest.TestCase):
+    def test_exampleFile(self):
+        self.assertEqual(sol.solve_streaming('example.txt'), (3749, 11387))
+
+
+    def test_iterEquations_isLazy(self):
+        lines = iter(["190: 10 19\n", "not an equation\n"])
+
+        eqs = sol.iter_equations(lines)
+
+        self.assertEqual(next(eqs), sol.Equation(190, [10, 19]))
+        with self.assertRaises(ValueError):
+            next(eqs)
+
+
+    def test_iterEquations_skipsBlankLines(self):
+        self.assertEqual(list(sol.iter_equations(["83: 17 5\r\n", "\n"])), [sol.Equation(83, [17, 5])])
+
+
+    def test_malformedLines_raise(self):
+        for line in ["83 17 5", "83:", "83:17 5", "83: 17 x", ": 17"]:
+            with self.subTest(line=line), self.assertRaises(ValueError):
+                sol.parse(line)
+
+
+class TestParallel(unittest.TestCase):
+    def test_balancedChunks_keepEveryEquation(self):
+        eqs = sol.parse(gen.generate(sol.DAY, 100, 4))
+
+        chunks = sol.balanced_chunks(eqs, 7)
+
+        self.assertEqual(len(chunks), 7)
+        self.assertCountEqual([eq.value for chunk in chunks for eq in chunk], [eq.value for eq in eqs])
+        costs = [sum(sol.equation_cost(eq) for eq in chunk) for chunk in chunks]
+        self.assertLessEqual(max(costs) - min(costs), max(sol.equation_cost(eq) for eq in eqs))
+
+
+    def test_moreChunksThanEquations(self):
+        self.assertEqual(len(sol.balanced_chunks(sol.parse(EXAMPLE), 20)), 9)
+
+
+    def test_matchesSerial(self):
+        eqs = sol.parse(gen.generate(sol.DAY, 200, 5))
+
+        self.assertEqual(sol.sum_satisfying_parallel(eqs, ALL_OPS, workers=2), sol.part2(eqs))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,23 @@
+import generate as gen
+import random
 import solution2024_8 as sol
 import unittest as ut
 
+EXAMPLE = """
+............
+........0...
+.....0......
+.......0....
+....0.......
+......A.....
+............
+............
+........A...
+.........A..
+............
+............
+""".strip()
+
 
 class TwoAntennaOneFreqTestCase(ut.TestCase):
     def setUp(self):
@@ -238,5 +255,148 @@ class Pt2ManyAntennaTwoFreqTestCase(ut.TestCase):
         self.assertEqual(sol.count_antinodes(antinodes), 34)
 
 
+class BitmapEngineTestCase(ut.TestCase):
+    def test_example(self):
+        g = sol.parse(EXAMPLE)
+
+        self.assertEqual(sol.part1(g), 14)
+        self.assertEqual(sol.part2(g), 34)
+
+
+    def test_reduceStep_isExact(self):
+        self.assertEqual(sol.reduce_step(6 - 9j), 2 - 3j)
+        self.assertEqual(sol.reduce_step(-4 + 0j), -1 + 0j)
+
+
+    def test_commonFactor_marksCellsBetween(self):
+        g = sol.parse_input("a....\n.....\n..a..\n.....\n.....")
+
+        self.assertEqual(sol.part2(g), 5)
+        self.assertEqual(sol.count_antinodes(sol.calculate_antinodes_pt2(g)), 5)
+
+
+    def test_multipleRange(self):
+        for start, step, size in [(5, 1, 10), (5, -1, 10), (3, 4, 20), (17, -3, 20), (0, 7, 7)]:
+            lo, hi = sol.multiple_range(start, step, size)
+            expected = [n for n in range(-size, size + 1) if 0 <= start + n * step < size]
+            self.assertEqual(list(range(lo, hi + 1)), expected)
+
+
+    def test_generated_matchesDictEngine(self):
+        for seed in range(3):
+            g = sol.parse(gen.generate(sol.DAY, 60, seed))
+
+            self.assertEqual(sol.part1(g), sol.count_antinodes(sol.calculate_antinodes(g)))
+            self.assertEqual(sol.part2(g), sol.count_antinodes(sol.calculate_antinodes_pt2(g)))
+
+
+class ParallelTestCase(ut.TestCase):
+    def test_packBitmap(self):
+        self.assertEqual(sol.pack_bitmap(bytearray([1, 0, 0, 1, 1])), 0b11001)
+        self.assertEqual(sol.pack_bitmap(bytearray(3)), 0)
+
+
+    def test_generated_matchesSerial(self):
+        g = sol.parse(gen.generate(sol.DAY, 60, 4))
+
+        self.assertEqual(sol.count_antinodes_parallel(g, workers=2), sol.part1(g))
+        self.assertEqual(sol.count_antinodes_parallel(g, resonant=True, workers=2), sol.part2(g))
+
+
+class AntinodeIndexTestCase(ut.TestCase):
+    def test_example(self):
+        g = sol.parse(EXAMPLE)
+
+        self.assertEqual(sol.AntinodeIndex(g).count(), 14)
+        self.assertEqual(sol.AntinodeIndex(g, resonant=True).count(), 34)
+
+
+    def test_addAndRemove_matchRecomputing(self):
+        g = sol.parse(gen.generate(sol.DAY, 40, 6))
+        rng = random.Random(6)
+        for resonant in [False, True]:
+            index = sol.AntinodeIndex(g, resonant)
+            expected = sol.part2 if resonant else sol.part1
+            for _ in range(30):
+                if rng.random() < 0.5 and index.grid.antennae:
+                    index.remove_antenna(rng.choice(list(index.grid.antennae)))
+                else:
+                    free = [row + 1j * col for row in range(40) for col in range(40)
+                            if row + 1j * col not in index.grid.antennae]
+                    index.add_antenna(rng.choice(free), rng.choice('aAb'))
+                with self.subTest(resonant=resonant):
+                    self.assertEqual(index.count(), expected(index.grid))
+
+
+    def test_outOfBounds_raises(self):
+        index = sol.AntinodeIndex(sol.parse(EXAMPLE))
+
+        for pos in [-1 + 0j, 12 + 0j, 0 + 12j, 3 - 1j, 1 - 1j, 1.5 + 2j]:
+            with self.subTest(pos=pos):
+                with self.assertRaises(ValueError):
+                    index.add_antenna(pos, 'a')
+                with self.assertRaises(ValueError):
+                    index.remove_antenna(pos)
+                with self.assertRaises(ValueError):
+                    index.is_antinode(pos)
+        self.assertEqual(index.count(), 14)
+
+
+    def test_removingEveryAntenna_leavesNoAntinodes(self):
+        g = sol.parse(EXAMPLE)
+        index = sol.AntinodeIndex(g, resonant=True)
+
+        for pos in list(g.antennae):
+            index.remove_antenna(pos)
+
+        self.assertEqual(index.count(), 0)
+        self.assertEqual(index.grid.freqs, set())
+        self.assertFalse(any(index.pair_counts))
+
+
+    def test_doesNotModifyGrid(self):
+        g = sol.parse(EXAMPLE)
+
+        sol.AntinodeIndex(g).remove_antenna(8+8j)
+
+        self.assertIn(8+8j, g.antennae)
+
+
+    def test_addOnAntenna_raises(self):
+        with self.assertRaises(ValueError):
+            sol.AntinodeIndex(sol.parse(EXAMPLE)).add_antenna(8+8j, 'A')
+
+
+@ut.skipIf(sol.np is None, "numpy is not installed")
+class NumpyBitmapEngineTestCase(ut.TestCase):
+    def test_example(self):
+        g = sol.parse(EXAMPLE)
+
+        self.assertEqual(sol.antinode_bitmap_pt2_numpy(g).tolist(), [b == 1 for b in sol.antinode_bitmap_pt2(g)])
+
+
+    def test_generated_matchesBytearray(self):
+        for seed in range(3):
+            g = sol.parse(gen.generate(sol.DAY, 60, seed))
+
+            self.assertEqual(sol.antinode_bitmap_pt2_numpy(g).tolist(), [b == 1 for b in sol.antinode_bitmap_pt2(g)])
+
+
+    def test_nonSquare_linesAlongAnAxis(self):
+        for input, expected in [('.aB..a.', 7), ('.\na\nB\n.\n.\na\n.', 7)]:
+            with self.subTest(input=input):
+                self.assertEqual(int(sol.antinode_bitmap_pt2_numpy(sol.parse(input)).sum()), expected)
+
+
+    def test_randomNonSquare_matchesBytearray(self):
+        rng = random.Random(8)
+        for _ in range(200):
+            rows, cols = rng.randint(1, 9), rng.randint(1, 9)
+            input = '\n'.join(''.join(rng.choice('......aA') for _ in range(cols)) for _ in range(rows))
+            g = sol.parse(input)
+            with self.subTest(input=input):
+                self.assertEqual(sol.antinode_bitmap_pt2_numpy(g).tolist(), [b == 1 for b in sol.antinode_bitmap_pt2(g)])
+
+
 if __name__ == '__main__':
     ut.main()
\ No newline at end of file
@@ -1,13 +1,14 @@
+import generate as gen
 import solution2024_9 as sol
 import unittest
 
 
 class TestLeftmostFreeIndex(unittest.TestCase):
     def setUp(self):
-        pass
+        self.parse = sol.parse_input
 
     def test_oneFileLongEmpty_returnsStartOfEmpty(self):
-        disk = sol.parse_input("15")
+        disk = self.parse("15")
 
         lfi = sol.leftmost_free_index(disk)
 
@@ -15,7 +16,7 @@ class TestLeftmostFreeIndex(unittest.TestCase):
 
 
     def test_oneFileLongEmpty_startInEmpty_returnsStartIndex(self):
-        disk = sol.parse_input("15")
+        disk = self.parse("15")
 
         lfi = sol.leftmost_free_index(disk, start_i=2)
 
@@ -23,7 +24,7 @@ class TestLeftmostFreeIndex(unittest.TestCase):
 
 
     def test_oneFileShortEmpty_sizeTooBig_returnsNone(self):
-        disk = sol.parse_input("12")
+        disk = self.parse("12")
 
         lfi = sol.leftmost_free_index(disk, size=3)
 
@@ -31,19 +32,154 @@ class TestLeftmostFreeIndex(unittest.TestCase):
 
 
     def test_oneFile_startInEmpty_sizeTooBig_returnsNone(self):
-        disk = sol.parse_input("15")
+        disk = self.parse("15")
 
         lfi = sol.leftmost_free_index(disk, start_i=4, size=3)
 
         self.assertIsNone(lfi)
 
     def test_twoFiles_firstEmptyTooSmall_returnsStartOfSecond(self):
-        disk = sol.parse_input("2234")
+        disk = self.parse("2234")
 
         lfi = sol.leftmost_free_index(disk, size=3)
 
         self.assertEqual(lfi, 7)
 
 
+@unittest.skipIf(sol.np is None, "numpy is not installed")
+class TestLeftmostFreeIndexNumpy(TestLeftmostFreeIndex):
+    def setUp(self):
+        self.parse = sol.parse_numpy
+
+
+class TestCompactPt2SegmentTree(unittest.TestCase):
+    def test_example_matchesExpectedLayout(self):
+        disk = sol.parse_input(sol.EXAMPLE_INPUT)
+
+        compacted = sol.compact_pt2_segment_tree(disk)
+
+        self.assertEqual(sol.render_disk(compacted), "00992111777.44.333....5555.6666.....8888..")
+        self.assertEqual(sol.checksum(compacted), 2858)
+
+
+    def test_generatedDisks_matchTry2(self):
+        for seed in range(5):
+            disk = sol.parse_input(gen.generate(9, 300, seed))
+
+            self.assertEqual(sol.compact_pt2_segment_tree(disk), sol.compact_pt2_try2(disk))
+
+
+class TestFreeSpanIndex(unittest.TestCase):
+    def test_leftmost_skipsTooSmallSpans(self):
+        index = sol.FreeSpanIndex([sol.Interval(2, 3, sol.EMPTY), sol.Interval(6, 9, sol.EMPTY)])
+
+        self.assertEqual(index.leftmost(3, before_i=20), 1)
+        self.assertIsNone(index.leftmost(3, before_i=6))
+        self.assertIsNone(index.leftmost(5, before_i=20))
+
+
+    def test_allocate_shrinksSpanFromFront(self):
+        index = sol.FreeSpanIndex([sol.Interval(2, 3, sol.EMPTY), sol.Interval(6, 9, sol.EMPTY)])
+
+        self.assertEqual(index.allocate(1, 3), 6)
+        self.assertEqual(index.leftmost(1, before_i=20), 0)
+        self.assertEqual(index.allocate(0, 2), 2)
+        self.assertEqual(index.leftmost(1, before_i=20), 1)
+        self.assertEqual(index.allocate(1, 1), 9)
+        self.assertIsNone(index.leftmost(1, before_i=20))
+
+
+class TestExtentDisk(unittest.TestCase):
+    def test_parseExtents_matchesParseInput(self):
+        disk = sol.parse_extents(sol.EXAMPLE_INPUT)
+
+        self.assertEqual(disk.to_blocks(), sol.parse_input(sol.EXAMPLE_INPUT))
+
+
+    def test_zeroLengthFiles_haveNoExtent(self):
+        disk = sol.parse_extents("20032")
+
+        self.assertEqual(list(disk.file), [0, 2])
+        self.assertEqual(sol.render_disk(disk), "00...22")
+
+
+    def test_example_compact(self):
+        compacted = sol.compact(sol.parse_extents(sol.EXAMPLE_INPUT))
+
+        self.assertEqual(sol.render_disk(compacted), "0099811188827773336446555566..............")
+        self.assertEqual(sol.checksum(compacted), 1928)
+
+
+    def test_example_compactPt2(self):
+        compacted = sol.compact_pt2_try2(sol.parse_extents(sol.EXAMPLE_INPUT))
+
+        self.assertEqual(sol.render_disk(compacted), "00992111777.44.333....5555.6666.....8888..")
+        self.assertEqual(sol.checksum(compacted), 2858)
+
+
+    def test_generatedDisks_matchPerBlock(self):
+        for seed in range(5):
+            disk_map = gen.generate(9, 300, seed)
+            disk = sol.parse_input(disk_map)
+            extents = sol.parse_extents(disk_map)
+
+            self.assertEqual(sol.compact(extents).to_blocks(), sol.compact(disk))
+            self.assertEqual(sol.compact_pt2_try2(extents).to_blocks(), sol.compact_pt2_try2(disk))
+            self.assertEqual(sol.checksum(extents), sol.checksum(disk))
+
+
+class TestChecksumStreaming(unittest.TestCase):
+    def test_example(self):
+        self.assertEqual(sol.checksum_streaming(sol.EXAMPLE_INPUT.encode()), 1928)
+
+
+    def test_trailingNewline_isIgnored(self):
+        self.assertEqual(sol.checksum_streaming(b"12345\n"), sol.solve_pt1("12345", 'blocks'))
+
+
+    def test_singleFile_staysInPlace(self):
+        self.assertEqual(sol.checksum_streaming(b"3"), 0)
+
+
+    def test_trailingFreeSpace_isIgnored(self):
+        self.assertEqual(sol.checksum_streaming(b"1013"), 1)
+
+
+    def test_generatedDisks_matchPerBlock(self):
+        for seed in range(10):
+            disk_map = gen.generate(9, 200, seed)
+
+            self.assertEqual(sol.solve_pt1(disk_map, 'streaming'), sol.solve_pt1(disk_map, 'blocks'))
+
+
+@unittest.skipIf(sol.np is None, "numpy is not installed")
+class TestNumpyEngine(unittest.TestCase):
+    def test_parseNumpy_matchesParseInput(self):
+        self.assertEqual(sol.parse_numpy(sol.EXAMPLE_INPUT).tolist(), sol.parse_input(sol.EXAMPLE_INPUT))
+
+
+    def test_example_compact(self):
+        compacted = sol.compact_numpy(sol.parse_numpy(sol.EXAMPLE_INPUT))
+
+        self.assertEqual(sol.render_disk(compacted.tolist()), "0099811188827773336446555566..............")
+        self.assertEqual(sol.checksum_numpy(compacted), 1928)
+
+
+    def test_generatedDisks_matchPerBlock(self):
+        for seed in range(5):
+            disk_map = gen.generate(9, 300, seed)
+            disk = sol.parse_input(disk_map)
+
+            self.assertEqual(sol.compact_numpy(sol.parse_numpy(disk_map)).tolist(), sol.compact(disk))
+            self.assertEqual(sol.solve_pt1(disk_map, 'numpy'), sol.solve_pt1(disk_map, 'blocks'))
+
+
+    def test_checksum_largerThanInt64_doesNotOverflow(self):
+        size = 4_000_000
+        disk = sol.np.full(size, 2_000_000, dtype=sol.np.int64)
+
+        self.assertEqual(sol.checksum_numpy(disk), 2_000_000 * (size * (size - 1) // 2))
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file